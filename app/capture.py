@@ -0,0 +1,264 @@
+import glob
+import os
+import sys
+import time
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+
+
+@dataclass(frozen=True, slots=True)
+class Frame:
+    """One captured BGR image plus when it was captured"""
+    image: np.ndarray
+    timestamp: float  # seconds, time.perf_counter() clock (or replay clock)
+    index: int
+
+
+class FrameSource:
+    """
+    Base class for everything that produces frames for the gesture pipeline.
+    Subclasses implement _open(), _read() and _close(); read() adds the
+    capture timestamp and frame index.
+    """
+    def __init__(self, width=640, height=480, fps=30, fourcc="MJPG", buffer_size=1):
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.fourcc = fourcc
+        self.buffer_size = buffer_size
+        self.exhausted = False  # True once a finite source has no more frames
+        self._index = 0
+
+    def open(self):
+        """Open the source. Returns False if it is not available."""
+        self.exhausted = False
+        self._index = 0
+        return self._open()
+
+    def read(self):
+        """Return the next Frame, or None if no frame is available now."""
+        image = self._read()
+        if image is None:
+            return None
+        frame = Frame(image, self._timestamp(), self._index)
+        self._index += 1
+        return frame
+
+    def close(self):
+        self._close()
+
+    def set_resolution(self, width, height):
+        """Change the capture resolution of an open source."""
+        self.width = width
+        self.height = height
+
+    def _timestamp(self):
+        return time.perf_counter()
+
+    def _resize(self, image):
+        if self.width and self.height and image.shape[:2] != (self.height, self.width):
+            image = cv2.resize(image, (self.width, self.height), interpolation=cv2.INTER_AREA)
+        return image
+
+    def _open(self):
+        raise NotImplementedError
+
+    def _read(self):
+        raise NotImplementedError
+
+    def _close(self):
+        pass
+
+
+class PacedSource(FrameSource):
+    """
+    Base for sources without their own clock (files, synthetic frames).
+    With realtime=True frames are released at fps; otherwise as fast as they
+    are read and timestamped on a virtual clock (index / fps), which makes
+    replays deterministic.
+    """
+    def __init__(self, realtime=True, loop=False, **kwargs):
+        super().__init__(**kwargs)
+        self.realtime = realtime
+        self.loop = loop
+        self._next_time = None
+
+    def read(self):
+        if self.realtime:
+            now = time.perf_counter()
+            if self._next_time is None:
+                self._next_time = now
+            elif now < self._next_time:
+                time.sleep(self._next_time - now)
+            self._next_time += 1.0 / self.fps
+        return super().read()
+
+    def _timestamp(self):
+        if self.realtime:
+            return time.perf_counter()
+        return self._index / self.fps
+
+
+class CameraSource(FrameSource):
+    """Live camera through cv2.VideoCapture with an explicit capture backend"""
+    BACKENDS = {
+        "any": cv2.CAP_ANY,
+        "dshow": cv2.CAP_DSHOW,
+        "msmf": cv2.CAP_MSMF,
+        "v4l2": cv2.CAP_V4L2,
+    }
+
+    def __init__(self, device=0, backend="auto", **kwargs):
+        super().__init__(**kwargs)
+        self.device = device
+        if backend == "auto":
+            backend = "dshow" if sys.platform == "win32" else "v4l2" if sys.platform.startswith("linux") else "any"
+        self.backend = backend
+        self.cap = None
+
+    def _open(self):
+        self.cap = cv2.VideoCapture(self.device, self.BACKENDS[self.backend])
+        if not self.cap.isOpened():
+            return False
+        # FOURCC primero: en V4L2 limita las resoluciones y fps disponibles
+        if self.fourcc:
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*self.fourcc))
+        self._apply_resolution()
+        self.cap.set(cv2.CAP_PROP_FPS, self.fps)
+        # Buffer de 1: siempre el frame más reciente, nunca uno encolado
+        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, self.buffer_size)
+        return True
+
+    def _apply_resolution(self):
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+
+    def set_resolution(self, width, height):
+        super().set_resolution(width, height)
+        if self.cap is not None and self.cap.isOpened():
+            self._apply_resolution()
+
+    def _read(self):
+        success, image = self.cap.read()
+        return image if success else None
+
+    def _close(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+
+class V4L2Source(CameraSource):
+    """Linux camera through Video4Linux2; device may be an index or /dev/videoN"""
+    def __init__(self, device=0, **kwargs):
+        super().__init__(device=device, backend="v4l2", **kwargs)
+
+
+class VideoFileSource(PacedSource):
+    """Frames decoded from a video file, resized to the configured resolution"""
+    def __init__(self, path, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self.cap = None
+
+    def _open(self):
+        self.cap = cv2.VideoCapture(self.path)
+        return self.cap.isOpened()
+
+    def _read(self):
+        success, image = self.cap.read()
+        if not success and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            success, image = self.cap.read()
+        if not success:
+            self.exhausted = True
+            return None
+        return self._resize(image)
+
+    def _close(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+
+class ImageSequenceSource(PacedSource):
+    """Frames from image files matching a glob pattern, in name order"""
+    def __init__(self, pattern, **kwargs):
+        super().__init__(**kwargs)
+        if os.path.isdir(pattern):
+            pattern = os.path.join(pattern, "*")
+        self.pattern = pattern
+        self.paths = []
+        self._position = 0
+
+    def _open(self):
+        self.paths = sorted(glob.glob(self.pattern))
+        self._position = 0
+        return bool(self.paths)
+
+    def _read(self):
+        if self._position >= len(self.paths):
+            if not self.loop:
+                self.exhausted = True
+                return None
+            self._position = 0
+        image = cv2.imread(self.paths[self._position])
+        self._position += 1
+        return None if image is None else self._resize(image)
+
+
+class SyntheticSource(PacedSource):
+    """Generated frames (a bright disc sweeping across a gradient); needs no hardware"""
+    def __init__(self, frames=0, **kwargs):
+        super().__init__(**kwargs)
+        self.frames = frames  # 0 = endless
+        self._background = None
+
+    def _open(self):
+        self._background = None
+        return True
+
+    def _read(self):
+        if self.frames and self._index >= self.frames:
+            self.exhausted = True
+            return None
+        if self._background is None or self._background.shape[:2] != (self.height, self.width):
+            ramp = np.linspace(40, 120, self.width, dtype=np.uint8)
+            self._background = np.repeat(np.tile(ramp, (self.height, 1))[:, :, None], 3, axis=2)
+        image = self._background.copy()
+        period = max(int(self.fps * 2), 1)
+        phase = (self._index % period) / period
+        x = int(self.width * (0.1 + 0.8 * abs(2 * phase - 1)))
+        cv2.circle(image, (x, self.height // 2), max(self.height // 10, 4), (255, 255, 255), -1)
+        return image
+
+
+def create_frame_source(config):
+    """Build the FrameSource described by the [Camera] section of config.ini"""
+    kind = config.get("Camera", "Source", fallback="camera").lower()
+    common = {
+        "width": config.getint("Camera", "Width", fallback=640),
+        "height": config.getint("Camera", "Height", fallback=480),
+        "fps": config.getfloat("Camera", "FPS", fallback=30),
+        "fourcc": config.get("Camera", "Format", fallback="MJPG"),
+        "buffer_size": config.getint("Camera", "BufferSize", fallback=1),
+    }
+    device = config.get("Camera", "Device", fallback="0")
+    device = int(device) if device.isdigit() else device
+    path = config.get("Camera", "Path", fallback="")
+    loop = config.getboolean("Camera", "Loop", fallback=False)
+
+    if kind == "camera":
+        backend = config.get("Camera", "Backend", fallback="auto").lower()
+        return CameraSource(device=device, backend=backend, **common)
+    if kind == "v4l2":
+        return V4L2Source(device=device, **common)
+    if kind == "file":
+        return VideoFileSource(path, loop=loop, **common)
+    if kind == "images":
+        return ImageSequenceSource(path, loop=loop, **common)
+    if kind == "synthetic":
+        return SyntheticSource(**common)
+    raise ValueError(f"Fuente de cámara desconocida en config.ini: {kind}")
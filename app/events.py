@@ -0,0 +1,78 @@
+import enum
+import threading
+from collections import deque
+from dataclasses import dataclass
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+
+class GestureKind(enum.IntEnum):
+    HOVER = 0  # x, y normalized to the camera frame (0..1)
+    CLICK = 1  # fist
+    BACK = 2   # peace sign
+    SWIPE = 3  # direction
+
+
+@dataclass(frozen=True, slots=True)
+class GestureEvent:
+    """One gesture delivered to the UI"""
+    kind: GestureKind
+    x: float = 0.0
+    y: float = 0.0
+    direction: str = ""  # swipe: "right" | "left" | "up" | "down"
+
+
+class GestureChannel(QObject):
+    """
+    Delivers gestures from the camera thread to the GUI thread.
+
+    Discrete gestures (click, back, swipe) are queued and always delivered.
+    Hover is coalesced: only the latest position is kept until the GUI
+    drains the channel, so a GUI that falls behind gets the newest position
+    instead of a backlog. At most one `ready` notification is in the Qt
+    event queue at any time, however many frames arrive meanwhile.
+    """
+    ready = pyqtSignal()
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._events = deque()
+        self._hover = None
+        self._pending = False
+        self.coalesced = 0  # hover positions replaced before being delivered
+
+    def hover(self, x, y):
+        """Producer side: publish the latest hover position."""
+        with self._lock:
+            if self._hover is not None:
+                self.coalesced += 1
+            self._hover = GestureEvent(GestureKind.HOVER, x, y)
+            notify = not self._pending
+            self._pending = True
+        if notify:
+            self.ready.emit()
+
+    def post(self, kind, direction=""):
+        """Producer side: queue a discrete gesture."""
+        with self._lock:
+            # El hover pendiente va antes: el click actúa sobre el botón que ya se vio
+            if self._hover is not None:
+                self._events.append(self._hover)
+                self._hover = None
+            self._events.append(GestureEvent(kind, direction=direction))
+            notify = not self._pending
+            self._pending = True
+        if notify:
+            self.ready.emit()
+
+    def drain(self):
+        """Consumer side: the queued events in order, then the latest hover."""
+        with self._lock:
+            events = list(self._events)
+            self._events.clear()
+            if self._hover is not None:
+                events.append(self._hover)
+                self._hover = None
+            self._pending = False
+        return events
@@ -0,0 +1,75 @@
+import math
+
+import numpy as np
+
+
+class OneEuroFilter:
+    """
+    One Euro filter (Casiez et al., CHI 2012) for a point: a low-pass filter
+    whose cutoff rises with speed, so a still hand is steady and a moving
+    one is followed with little lag.
+    """
+    def __init__(self, min_cutoff=1.0, beta=5.0, d_cutoff=1.0):
+        self.min_cutoff = min_cutoff  # Hz, smoothing at rest
+        self.beta = beta              # cutoff increase per unit/s of speed
+        self.d_cutoff = d_cutoff      # Hz, smoothing of the speed estimate
+        self.reset()
+
+    def reset(self):
+        self.value = None
+        self.velocity = None
+        self.timestamp = None
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def __call__(self, point, timestamp):
+        """Filter a point (array-like) captured at timestamp (s)."""
+        point = np.asarray(point, dtype=np.float64)
+        if self.value is None:
+            self.value = point
+            self.velocity = np.zeros_like(point)
+            self.timestamp = timestamp
+            return self.value
+        dt = timestamp - self.timestamp
+        if dt <= 0:
+            return self.value
+
+        raw_velocity = (point - self.value) / dt
+        self.velocity = self.velocity + self._alpha(self.d_cutoff, dt) * (raw_velocity - self.velocity)
+        cutoff = self.min_cutoff + self.beta * float(np.linalg.norm(self.velocity))
+        self.value = self.value + self._alpha(cutoff, dt) * (point - self.value)
+        self.timestamp = timestamp
+        return self.value
+
+
+class CursorFilter:
+    """
+    Smooths the hover cursor (normalized frame coordinates) with a One Euro
+    filter and extrapolates it lead_ms ahead along the filtered velocity,
+    to make up for capture and inference latency.
+    """
+    def __init__(self, min_cutoff=1.0, beta=5.0, d_cutoff=1.0, lead_ms=40.0):
+        self.filter = OneEuroFilter(min_cutoff, beta, d_cutoff)
+        self.lead = lead_ms / 1000.0
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            min_cutoff=config.getfloat("Cursor", "MinCutoff", fallback=1.0),
+            beta=config.getfloat("Cursor", "Beta", fallback=5.0),
+            d_cutoff=config.getfloat("Cursor", "DerivativeCutoff", fallback=1.0),
+            lead_ms=config.getfloat("Cursor", "LeadMs", fallback=40.0),
+        )
+
+    def reset(self):
+        """Forget the trajectory (the hand stopped hovering)."""
+        self.filter.reset()
+
+    def __call__(self, x, y, timestamp):
+        value = self.filter((x, y), timestamp)
+        if self.lead:
+            value = value + self.filter.velocity * self.lead
+        return min(max(float(value[0]), 0.0), 1.0), min(max(float(value[1]), 0.0), 1.0)
@@ -0,0 +1,199 @@
+from dataclasses import dataclass
+
+# Qué hace cada gesto conocido con su regla:
+#   trigger: dispara una vez tras mantener la máscara hold_ms y entra en cooldown
+#   hold:    activo mientras la máscara se mantenga al menos hold_ms
+#   motion:  solo habilita un detector de movimiento (swipe), que dispara él mismo
+RULE_KINDS = {
+    "click": "trigger",
+    "back": "trigger",
+    "pointing": "hold",
+    "swipe": "motion",
+}
+
+# Tamaño de mano típico (px, muñeca -> nudillo medio) a 640x480, para
+# convertir umbrales antiguos en píxeles
+REFERENCE_HAND_SCALE = 90.0
+
+DEFAULT_RULES = {
+    "click": "01111",
+    "back": "01100",
+    "pointing": "01000",
+    "swipe": "11111",
+}
+
+
+def parse_mask(text):
+    """'01111' (thumb..pinky) -> 5-bit finger mask with bit 0 = thumb"""
+    text = text.strip()
+    if len(text) != 5 or set(text) - {"0", "1"}:
+        raise ValueError(f"Máscara de dedos inválida: {text!r}")
+    return sum(1 << i for i, c in enumerate(text) if c == "1")
+
+
+@dataclass(frozen=True, slots=True)
+class GestureRule:
+    name: str
+    kind: str             # trigger | hold | motion
+    masks: tuple          # finger masks that select this rule
+    hold_ms: float = 0    # debounce: how long the mask must be held (motion: minimum duration)
+    cooldown_ms: float = 0  # blocked time after firing
+    threshold: float = 0  # motion rules: minimum displacement, in hand sizes
+    window_ms: float = 0  # motion rules: history kept for the movement
+    axes: str = "x"       # motion rules: "x" (left/right) or "xy" (also up/down)
+
+
+class GestureEngine:
+    """
+    Classifies a finger mask with a 32-entry lookup table compiled from the
+    rules and keeps per-rule debounce and cooldown state. Every per-frame
+    operation is O(1): one table lookup and at most two state updates.
+    Timing uses the capture timestamps given to update(), so gestures feel
+    the same at any frame rate and with skipped inference frames.
+    """
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self.index = {rule.name: i for i, rule in enumerate(self.rules)}
+        table = [-1] * 32
+        for i, rule in enumerate(self.rules):
+            for mask in rule.masks:
+                if table[mask] != -1:
+                    raise ValueError(f"La máscara {mask:05b} está en {self.rules[table[mask]].name} y {rule.name}")
+                table[mask] = i
+        self.table = tuple(table)
+
+        self.now = 0.0  # timestamp of the last update() (seconds)
+        self.active = -1  # rule selected by the current mask
+        self.held_since = [None] * len(self.rules)
+        self.cooldown_until = [float("-inf")] * len(self.rules)
+
+    @classmethod
+    def from_config(cls, config):
+        """Rules from [GestureRules], thresholds from [GestureThresholds]"""
+        section = "GestureThresholds"
+
+        def legacy_frames(key):
+            # config.ini antiguos: umbrales en frames, convertidos suponiendo 30 fps
+            return config.getint(section, key) if config.has_option(section, key) else None
+
+        def hold(key, legacy_key, fallback, inclusive=True):
+            frames = legacy_frames(legacy_key)
+            if not config.has_option(section, key) and frames is not None:
+                # El contador antiguo confirmaba en el frame N (>= N) o, con
+                # pointing, en el N + 1 (> N): desde el primer frame hasta ese
+                return (frames - 1 if inclusive else frames) * 1000 // 30
+            return config.getfloat(section, key, fallback=fallback)
+
+        def cooldown(key, legacy_key, fallback):
+            frames = legacy_frames(legacy_key)
+            if not config.has_option(section, key) and frames is not None:
+                return frames * 1000 // 30
+            return config.getfloat(section, key, fallback=fallback)
+
+        def distance(key, legacy_key, fallback):
+            # Claves antiguas en píxeles a 640x480: mano de ~90 px
+            if not config.has_option(section, key) and config.has_option(section, legacy_key):
+                return config.getfloat(section, legacy_key) / REFERENCE_HAND_SCALE
+            return config.getfloat(section, key, fallback=fallback)
+
+        params = {
+            "click": {"hold_ms": hold("FistHoldMs", "FistFramesThreshold", 130),
+                      "cooldown_ms": cooldown("FistCooldownMs", "FistCooldown", 500)},
+            "back": {"hold_ms": hold("PeaceHoldMs", "PeaceFramesThreshold", 290),
+                     "cooldown_ms": cooldown("PeaceCooldownMs", "PeaceCooldown", 830)},
+            "pointing": {"hold_ms": hold("PointingHoldMs", "PointingFramesThreshold", 60, inclusive=False)},
+            "swipe": {"hold_ms": config.getfloat(section, "SwipeMinMs", fallback=230),
+                      "cooldown_ms": cooldown("SwipeCooldownMs", "SwipeCooldown", 830),
+                      "threshold": distance("SwipeDistance", "SwipeThreshold", 1.7),
+                      "window_ms": config.getfloat(section, "SwipeWindowMs", fallback=330),
+                      "axes": config.get(section, "SwipeAxes", fallback="x").strip().lower()},
+        }
+        definitions = dict(DEFAULT_RULES)
+        if config.has_section("GestureRules"):
+            definitions.update(config.items("GestureRules"))
+
+        rules = []
+        for name, masks in definitions.items():
+            if name not in RULE_KINDS:
+                print(f"Regla de gesto desconocida en config.ini: {name}")
+                continue
+            rules.append(GestureRule(
+                name, RULE_KINDS[name],
+                tuple(parse_mask(m) for m in masks.split(",") if m.strip()),
+                **params[name],
+            ))
+        return cls(rules)
+
+    def clone(self):
+        """A new engine with the same rules and no state (one per hand)."""
+        return type(self)(self.rules)
+
+    @classmethod
+    def default(cls):
+        import configparser
+        return cls.from_config(configparser.ConfigParser())
+
+    def classify(self, mask):
+        """Name of the rule selected by mask, or None."""
+        i = self.table[mask]
+        return self.rules[i].name if i >= 0 else None
+
+    def update(self, mask, timestamp):
+        """
+        Feed this frame's finger mask (None without a hand) and its capture
+        timestamp in seconds. Returns the name of the trigger rule that fired
+        on this frame, or None.
+        """
+        self.now = timestamp
+        active = -1 if mask is None else self.table[mask]
+        if active != self.active and self.active >= 0:
+            self.held_since[self.active] = None
+        self.active = active
+        if active < 0 or not self.ready_index(active):
+            return None  # en cooldown no cuenta como mantenido
+
+        if self.held_since[active] is None:
+            self.held_since[active] = timestamp
+        rule = self.rules[active]
+        if rule.kind == "trigger" and self.held_ms(active) >= rule.hold_ms:
+            self.fire_index(active)
+            return rule.name
+        return None
+
+    def held_ms(self, i):
+        since = self.held_since[i]
+        return 0.0 if since is None else (self.now - since) * 1000
+
+    def is_active(self, name):
+        """True while the mask selecting rule `name` has been held long enough."""
+        i = self.index.get(name, -1)
+        return i >= 0 and i == self.active and self.held_since[i] is not None \
+            and self.held_ms(i) >= self.rules[i].hold_ms
+
+    def held_since_time(self, name):
+        """Timestamp since which rule `name` has been held (None if it is not)."""
+        i = self.index.get(name, -1)
+        return None if i < 0 or i != self.active else self.held_since[i]
+
+    def selects(self, name):
+        """True if the current mask selects rule `name` (no debounce)."""
+        i = self.index.get(name, -1)
+        return i >= 0 and i == self.active
+
+    def ready(self, name):
+        i = self.index.get(name, -1)
+        return i >= 0 and self.ready_index(i)
+
+    def ready_index(self, i):
+        return self.now >= self.cooldown_until[i]
+
+    def fire(self, name):
+        """Start the cooldown of rule `name` (used by motion detectors)."""
+        self.fire_index(self.index[name])
+
+    def fire_index(self, i):
+        self.cooldown_until[i] = self.now + self.rules[i].cooldown_ms / 1000
+        self.held_since[i] = None
+
+    def rule(self, name):
+        return self.rules[self.index[name]]
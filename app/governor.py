@@ -0,0 +1,175 @@
+from dataclasses import dataclass
+
+import cv2
+
+
+class IdleGovernor:
+    """
+    Decides, frame by frame, whether hand inference has to run.
+    After idle_frames inferences without a hand the pipeline goes idle and
+    inference drops to idle_hz; the first detection restores the full rate.
+    With motion_gate, idle inference also waits until frame differencing
+    sees something move, so an empty static scene costs no inference at all.
+    """
+    MOTION_SIZE = (64, 48)
+    PIXEL_DELTA = 25  # gray levels for a thumbnail pixel to count as changed
+
+    def __init__(self, idle_frames=30, idle_hz=4.0, motion_gate=True, motion_threshold=1.0):
+        self.idle_frames = idle_frames  # 0 disables the governor
+        self.idle_interval = 1.0 / idle_hz if idle_hz > 0 else 0.0
+        self.motion_gate = motion_gate
+        self.motion_threshold = motion_threshold  # % of thumbnail pixels that changed
+
+        self.frames_without_hand = 0
+        self.last_inference = None
+        self.motion_seen = False
+        self._previous_small = None
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            idle_frames=config.getint("Performance", "IdleFramesThreshold", fallback=30),
+            idle_hz=config.getfloat("Performance", "IdleInferenceHz", fallback=4.0),
+            motion_gate=config.getboolean("Performance", "IdleMotionGate", fallback=True),
+            motion_threshold=config.getfloat("Performance", "MotionThreshold", fallback=1.0),
+        )
+
+    @property
+    def idle(self):
+        return bool(self.idle_frames) and self.frames_without_hand >= self.idle_frames
+
+    def should_infer(self, frame):
+        """Called for every captured Frame, before inference."""
+        if not self.idle:
+            self._previous_small = None
+            return True
+
+        if self.motion_gate and self._detect_motion(frame.image):
+            self.motion_seen = True
+
+        due = self.last_inference is None or frame.timestamp - self.last_inference >= self.idle_interval
+        if due and (self.motion_seen or not self.motion_gate):
+            self.motion_seen = False
+            return True
+        return False
+
+    def report(self, timestamp, hand_found):
+        """Called after every inference with whether a hand was found."""
+        self.last_inference = timestamp
+        if hand_found:
+            self.frames_without_hand = 0
+        else:
+            self.frames_without_hand += 1
+
+    def _detect_motion(self, img):
+        # Diferencia de frames en miniatura y escala de grises: unos pocos µs
+        small = cv2.cvtColor(cv2.resize(img, self.MOTION_SIZE, interpolation=cv2.INTER_AREA),
+                             cv2.COLOR_BGR2GRAY)
+        previous, self._previous_small = self._previous_small, small
+        if previous is None:
+            return False
+        _, changed = cv2.threshold(cv2.absdiff(small, previous), self.PIXEL_DELTA, 255, cv2.THRESH_BINARY)
+        return cv2.countNonZero(changed) * 100.0 > self.motion_threshold * small.size
+
+
+@dataclass(frozen=True, slots=True)
+class LoadLevel:
+    """One rung of the LoadGovernor ladder"""
+    model: str    # "full" | "lite"
+    scale: float  # capture resolution relative to the configured one
+    rate: int     # infer on one of every `rate` captured frames
+
+    def describe(self):
+        return f"modelo {self.model}, resolución x{self.scale:g}, inferencia en 1 de cada {self.rate} frames"
+
+
+class LoadGovernor:
+    """
+    Keeps hand inference inside a per-frame time budget.
+    Inference times are smoothed with an EMA and divided by the level's
+    frame rate divisor, giving the load per captured frame. When that stays
+    over the budget the governor steps down one level (lighter model first,
+    then a smaller capture resolution, then fewer inferred frames), and
+    when it stays well under the budget it steps back up. Every change is printed with its
+    reason. A level that had to be left for overload waits twice as long
+    before being tried again, so a machine on the edge does not oscillate.
+    """
+    def __init__(self, budget_ms=25.0, models=("full", "lite"), scales=(1.0, 0.75, 0.5), rates=(1, 2, 3),
+                 headroom=0.6, down_after=1.0, up_after=5.0, alpha=0.2):
+        self.budget = budget_ms / 1000.0
+        self.headroom = headroom      # step up below budget * headroom
+        self.down_after = down_after  # s over budget before stepping down
+        self.up_after = up_after      # s under headroom before stepping up
+        self.alpha = alpha
+
+        # Escalera: primero el modelo, luego la resolución, luego la frecuencia
+        lighter = models[-1]
+        self.levels = [LoadLevel(m, scales[0], rates[0]) for m in models]
+        self.levels += [LoadLevel(lighter, s, rates[0]) for s in scales[1:]]
+        self.levels += [LoadLevel(lighter, scales[-1], r) for r in rates[1:]]
+        self.index = 0
+        self.up_delay = [up_after] * len(self.levels)
+
+        self.average = None       # EMA of the inference time (s)
+        self.over_since = None    # first timestamp of the current run over budget
+        self.under_since = None   # first timestamp of the current run under headroom
+
+    @classmethod
+    def from_config(cls, config, models=("full", "lite")):
+        """None if [Performance] LoadGovernor is off."""
+        if not config.getboolean("Performance", "LoadGovernor", fallback=True):
+            return None
+        return cls(
+            budget_ms=config.getfloat("Performance", "InferenceBudgetMs", fallback=25.0),
+            models=models,
+            headroom=config.getfloat("Performance", "LoadHeadroom", fallback=0.6),
+            up_after=config.getfloat("Performance", "LoadStepUpSeconds", fallback=5.0),
+        )
+
+    @property
+    def level(self):
+        return self.levels[self.index]
+
+    def should_infer(self, frame):
+        """False for the captured frames not inferred at reduced rate."""
+        return frame.index % self.level.rate == 0
+
+    def report(self, timestamp, seconds):
+        """
+        Called after every inference with how long it took. Returns the new
+        LoadLevel when the governor changes level, otherwise None.
+        """
+        self.average = seconds if self.average is None else self.average + self.alpha * (seconds - self.average)
+        # Carga por frame capturado: con rate > 1 cada inferencia cubre varios frames
+        load = self.average / self.level.rate
+
+        if load > self.budget:
+            self.under_since = None
+            self.over_since = self.over_since if self.over_since is not None else timestamp
+            if timestamp - self.over_since >= self.down_after and self.index < len(self.levels) - 1:
+                self.up_delay[self.index] = min(self.up_delay[self.index] * 2, 300.0)
+                return self._change(self.index + 1, timestamp, "por encima del")
+        elif load < self.budget * self.headroom:
+            self.over_since = None
+            self.under_since = self.under_since if self.under_since is not None else timestamp
+            if self.index > 0 and timestamp - self.under_since >= self.up_delay[self.index - 1] and \
+                    not self._overloads(self.levels[self.index - 1]):
+                return self._change(self.index - 1, timestamp, "por debajo del")
+        else:
+            self.over_since = self.under_since = None
+        return None
+
+    def _overloads(self, level):
+        # Si solo cambia la frecuencia, el tiempo por inferencia no cambia y
+        # la carga del nivel superior se conoce de antemano
+        same = level.model == self.level.model and level.scale == self.level.scale
+        return same and self.average / level.rate > self.budget
+
+    def _change(self, index, timestamp, relation):
+        print(f"Rendimiento: carga media {self.average / self.level.rate * 1000:.1f} ms/frame "
+              f"(inferencia {self.average * 1000:.1f} ms, 1 de cada {self.level.rate}) {relation} "
+              f"presupuesto {self.budget * 1000:.0f} ms -> {self.levels[index].describe()}")
+        self.index = index
+        self.average = None  # medir de nuevo con la configuración nueva
+        self.over_since = self.under_since = None
+        return self.level
@@ -0,0 +1,51 @@
+class CoordinateMapper:
+    """
+    Affine map from normalized camera coordinates (0..1, as published by
+    the camera worker for any capture resolution) to global screen pixels.
+
+    Only the active region of the camera frame is used, so the hand does not
+    have to reach the edge of the image to reach the edge of the target, and
+    x is mirrored to match the mirrored video. The coefficients are
+    recomputed only by set_target() (resize, move or screen change); map()
+    is two multiply-adds and a clamp.
+    """
+    def __init__(self, region=(0.0, 0.0, 1.0, 1.0), mirror=True):
+        left, top, right, bottom = region
+        if not (0.0 <= left < right <= 1.0 and 0.0 <= top < bottom <= 1.0):
+            raise ValueError(f"Región activa inválida: {region}")
+        self.region = region  # left, top, right, bottom of the displayed frame (0..1)
+        self.mirror = mirror
+        self.target = None
+        self.set_target((0, 0, 1, 1))
+
+    @classmethod
+    def from_config(cls, config):
+        region = config.get("UI", "ActiveRegion", fallback="0, 0, 1, 1")
+        return cls(
+            region=tuple(float(value) for value in region.split(",")),
+            mirror=config.getboolean("UI", "Mirror", fallback=True),
+        )
+
+    def set_target(self, target):
+        """Target rectangle (x, y, width, height) in global pixels."""
+        if target == self.target:
+            return
+        self.target = target
+        x, y, width, height = target
+        left, top, right, bottom = self.region
+        # La región se expresa sobre la imagen tal como se ve (espejada)
+        scale_x = width / (right - left)
+        if self.mirror:
+            self.ax, self.bx = -scale_x, x + (1.0 - left) * scale_x
+        else:
+            self.ax, self.bx = scale_x, x - left * scale_x
+        self.ay = height / (bottom - top)
+        self.by = y - top * self.ay
+        self.min_x, self.max_x = x, x + width - 1
+        self.min_y, self.max_y = y, y + height - 1
+
+    def map(self, x, y):
+        """Global (x, y) pixel for normalized camera coordinates, clamped to the target."""
+        gx = min(max(int(self.ax * x + self.bx), self.min_x), self.max_x)
+        gy = min(max(int(self.ay * y + self.by), self.min_y), self.max_y)
+        return gx, gy
@@ -0,0 +1,76 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True, slots=True)
+class Motion:
+    """Movement of one landmark over a time window (pixels, seconds)"""
+    samples: int
+    duration: float           # s between the first and last sample
+    displacement: np.ndarray  # (2,) last - first position
+    velocity: np.ndarray      # (2,) mean px/s over the window
+    acceleration: np.ndarray  # (2,) px/s² between first and last step
+    consistency: np.ndarray   # (2,) fraction of steps moving with the displacement, per axis
+
+
+class LandmarkHistory:
+    """
+    Preallocated ring buffer with the last `size` hand landmark frames
+    (pixel coordinates) and their timestamps. push() is O(1) with no
+    allocation; motion() derives the temporal features of any landmark over
+    a time window with a few vectorized operations, for every detector.
+    """
+    def __init__(self, size=32):
+        self.size = size
+        self.landmarks = np.zeros((size, 21, 3), dtype=np.float32)
+        self.timestamps = np.zeros(size, dtype=np.float64)
+        self.head = 0   # next slot to write
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def push(self, landmarks, timestamp):
+        self.landmarks[self.head] = landmarks
+        self.timestamps[self.head] = timestamp
+        self.head = (self.head + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+
+    def clear(self):
+        self.count = 0
+
+    def rescale(self, sx, sy):
+        """Scale the stored x, y (and z, like x) after a frame size change."""
+        self.landmarks *= np.array((sx, sy, sx), dtype=np.float32)
+
+    def _indices(self, since):
+        # Índices en orden cronológico de las muestras con timestamp >= since
+        order = (self.head - self.count + np.arange(self.count)) % self.size
+        return order[self.timestamps[order] >= since]
+
+    def points(self, landmark, since=float("-inf")):
+        """(timestamps, (n, 2) positions) of one landmark since a time."""
+        idx = self._indices(since)
+        return self.timestamps[idx], self.landmarks[idx, landmark, :2]
+
+    def motion(self, landmark, since=float("-inf")):
+        """Motion of one landmark over the samples since a time, or None with < 3 samples."""
+        t, xy = self.points(landmark, since)
+        if len(t) < 3:
+            return None
+        steps = np.diff(xy, axis=0)
+        dt = np.maximum(np.diff(t), 1e-6)[:, None]
+        step_velocity = steps / dt
+        duration = float(t[-1] - t[0])
+        displacement = xy[-1] - xy[0]
+        consistency = (np.sign(steps) == np.sign(displacement)).mean(axis=0)
+        mid_span = max((t[-1] + t[-2] - t[1] - t[0]) / 2, 1e-6)
+        return Motion(
+            samples=len(t),
+            duration=duration,
+            displacement=displacement,
+            velocity=displacement / max(duration, 1e-6),
+            acceleration=(step_velocity[-1] - step_velocity[0]) / mid_span,
+            consistency=consistency,
+        )
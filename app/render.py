@@ -0,0 +1,186 @@
+import threading
+
+import cv2
+import numpy as np
+from PyQt6.QtCore import QLineF, QPointF, QRect, Qt
+from PyQt6.QtGui import QColor, QImage, QPainter, QPen, QPixmap
+from PyQt6.QtWidgets import QWidget
+
+from app.vision import HAND_CONNECTIONS, draw_overlay
+
+
+class FrameBuffers:
+    """
+    Triple buffer of preallocated BGR frames, each wrapped once in a QImage
+    that shares its memory. The worker fills back() and publish()es it; the
+    GUI paints front(). Neither side ever waits for or copies the other's frame.
+    In landmarks-only mode only the latest landmark points are exchanged.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buffers = []
+        self.shape = None
+        self._back, self._middle, self._front = 0, 1, 2
+        self._fresh = False
+        self._landmarks = (None, (), 0, 0)
+
+    def _allocate(self, shape):
+        h, w = shape[:2]
+        self._buffers = []
+        for _ in range(3):
+            array = np.zeros((h, w, 3), dtype=np.uint8)
+            # El QImage no copia: apunta a la memoria del array
+            image = QImage(array.data, w, h, 3 * w, QImage.Format.Format_BGR888)
+            self._buffers.append((array, image))
+        self.shape = (h, w, 3)
+        self._fresh = False
+
+    def back(self, shape):
+        """Array for the next frame (reallocated only when the size changes)."""
+        with self._lock:
+            if self.shape != (shape[0], shape[1], 3):
+                self._allocate(shape)
+            return self._buffers[self._back][0]
+
+    def publish(self):
+        """Hand the frame written to back() over to the painter."""
+        with self._lock:
+            self._back, self._middle = self._middle, self._back
+            self._fresh = True
+
+    def front(self):
+        """(array, QImage) of the newest published frame, or None."""
+        with self._lock:
+            if not self._buffers:
+                return None
+            if self._fresh:
+                self._front, self._middle = self._middle, self._front
+                self._fresh = False
+            # La tupla mantiene vivo el array mientras se pinta
+            return self._buffers[self._front]
+
+    def publish_landmarks(self, points, width, height, others=()):
+        """Latest (21, 2) pixel landmark points of the primary hand (or None),
+        the (n, 21, 2) points of the other hands and their frame size."""
+        self._landmarks = (points, others, width, height)  # una sola asignación: atómica
+
+    def landmarks(self):
+        return self._landmarks
+
+
+class FrameRenderer:
+    """Draws the overlay and writes the mirrored frame into FrameBuffers"""
+    def __init__(self, buffers, landmarks_only=False):
+        self.buffers = buffers
+        self.landmarks_only = landmarks_only
+
+    def render(self, img, features, gesture_state, gesture, show_cursor, others=()):
+        """others: (n, 21, 2) pixel landmarks of the hands besides the primary one."""
+        h, w = img.shape[:2]
+        if self.landmarks_only:
+            # Sin imagen: VideoView dibuja los puntos con QPainter
+            points = None if features is None else features.landmarks[:, :2]
+            self.buffers.publish_landmarks(points, w, h, others)
+            return
+        # Overlay en el frame (que ya no se usa para nada más) y espejo
+        # directo al buffer de salida, sin arrays intermedios
+        out = self.buffers.back(img.shape)
+        draw_overlay(img, features, gesture_state, gesture, show_cursor, others)
+        cv2.flip(img, 1, dst=out)
+        self.buffers.publish()
+
+
+class VideoView(QWidget):
+    """
+    Paints the newest FrameBuffers frame, aspect-fit, straight from paintEvent.
+    With landmarks_only it paints the hand skeleton as vectors over a cached
+    background, so no image is produced or uploaded at all.
+    """
+    def __init__(self, buffers, landmarks_only=False, parent=None):
+        super().__init__(parent)
+        self.buffers = buffers
+        self.landmarks_only = landmarks_only
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+        self.border_pen = QPen(QColor(255, 0, 0), 2)
+        self.background = QColor(0, 0, 0)
+        self._target = None
+        self._image_size = None
+        self._background_pixmap = None
+
+        # Puntos y líneas reutilizados en cada frame (se mutan, no se crean)
+        self.line_pen = QPen(QColor(224, 224, 224), 2)
+        self.point_pen = QPen(QColor(255, 0, 0), 4)
+        self.other_pen = QPen(QColor(140, 140, 140), 2)  # manos que no mueven el cursor
+        self._points = [QPointF() for _ in range(21)]
+        self._lines = [QLineF() for _ in range(len(HAND_CONNECTIONS))]
+        self._connections = HAND_CONNECTIONS.tolist()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._target = None
+        self._background_pixmap = None
+
+    def _target_rect(self, w, h):
+        # Rectángulo destino calculado una vez por tamaño de widget/frame
+        if self._target is None or self._image_size != (w, h):
+            scale = min(self.width() / w, self.height() / h)
+            tw, th = int(w * scale), int(h * scale)
+            self._target = QRect((self.width() - tw) // 2, (self.height() - th) // 2, tw, th)
+            self._image_size = (w, h)
+        return self._target
+
+    def _cached_background(self):
+        if self._background_pixmap is None:
+            pixmap = QPixmap(self.size())
+            pixmap.fill(self.background)
+            painter = QPainter(pixmap)
+            painter.setPen(self.border_pen)
+            painter.drawRect(self.rect().adjusted(1, 1, -1, -1))
+            painter.end()
+            self._background_pixmap = pixmap
+        return self._background_pixmap
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        if self.landmarks_only:
+            painter.drawPixmap(0, 0, self._cached_background())
+            self._paint_landmarks(painter)
+            return
+
+        painter.fillRect(self.rect(), self.background)
+        entry = self.buffers.front()
+        if entry is not None:
+            image = entry[1]
+            painter.drawImage(self._target_rect(image.width(), image.height()), image)
+        painter.setPen(self.border_pen)
+        painter.drawRect(self.rect().adjusted(1, 1, -1, -1))
+
+    def _paint_landmarks(self, painter):
+        points, others, w, h = self.buffers.landmarks()
+        if points is None and not len(others):
+            return
+        target = self._target_rect(w, h)
+        scale = target.width() / w
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        # Las demás manos debajo y atenuadas; la principal encima
+        for hand in others:
+            self._set_hand(hand, target, scale)
+            painter.setPen(self.other_pen)
+            painter.drawLines(self._lines)
+            painter.drawPoints(self._points)
+        if points is not None:
+            self._set_hand(points, target, scale)
+            painter.setPen(self.line_pen)
+            painter.drawLines(self._lines)
+            painter.setPen(self.point_pen)
+            painter.drawPoints(self._points)
+
+    def _set_hand(self, points, target, scale):
+        # Espejo horizontal, igual que el video
+        xs = target.right() - points[:, 0] * scale
+        ys = target.top() + points[:, 1] * scale
+        for point, x, y in zip(self._points, xs.tolist(), ys.tolist()):
+            point.setX(x)
+            point.setY(y)
+        for line, (a, b) in zip(self._lines, self._connections):
+            line.setPoints(self._points[a], self._points[b])
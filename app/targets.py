@@ -0,0 +1,163 @@
+from bisect import bisect_right
+
+from PyQt6.QtCore import QEvent, QObject, QPoint, QRect, QSize, Qt
+from PyQt6.QtGui import QColor, QPainter, QPen
+from PyQt6.QtWidgets import QPushButton, QWidget
+
+
+class TargetIndex(QObject):
+    """
+    Cached spatial index of the buttons the hover cursor can select.
+
+    The global rectangles of the visible, enabled buttons under the roots
+    (the current page and the floating overlays) are cut into a grid of
+    cells: columns between consecutive x edges, and rows between the y edges
+    of the targets in each column. A query is two bisects, O(log n), instead
+    of QApplication.widgetAt(). Rectangles are inflated by snap_radius, so
+    a point near a button also selects it (the nearest one wins).
+
+    The index is rebuilt lazily after invalidate(), which is called on page
+    switch and on any move, resize, show/hide or layout change seen by its
+    event filter.
+    """
+    WATCHED_EVENTS = {
+        QEvent.Type.Move, QEvent.Type.Resize, QEvent.Type.Show, QEvent.Type.Hide,
+        QEvent.Type.LayoutRequest, QEvent.Type.ChildAdded, QEvent.Type.ChildRemoved,
+        QEvent.Type.EnabledChange,
+    }
+
+    def __init__(self, snap_radius=0, parent=None):
+        super().__init__(parent)
+        self.snap_radius = snap_radius
+        self.roots = []
+        self.targets = []   # (button, (left, top, right, bottom)) global, exclusive right/bottom
+        self.rects = {}     # button -> its global rectangle
+        self.xs = []        # column edges
+        self.columns = []   # per column: (row edges, per row: candidate target indices)
+        self.dirty = True
+        self.rebuilds = 0
+
+    def set_roots(self, *roots):
+        """Index the buttons under these widgets (page switch)."""
+        self.roots = [root for root in roots if root is not None]
+        self.invalidate()
+
+    def invalidate(self):
+        self.dirty = True
+
+    def eventFilter(self, watched, event):
+        if event.type() in self.WATCHED_EVENTS:
+            self.dirty = True
+        return False
+
+    def _watch(self, widget):
+        # Vuelve a instalarse en cada rebuild: los hijos nuevos también avisan
+        widget.installEventFilter(self)
+        for child in widget.findChildren(QWidget):
+            child.installEventFilter(self)
+
+    def _collect(self):
+        targets = []
+        for root in self.roots:
+            self._watch(root)
+            buttons = [root] if isinstance(root, QPushButton) else []
+            buttons += root.findChildren(QPushButton)
+            for button in buttons:
+                if not (button.isVisible() and button.isEnabled()):
+                    continue
+                # Solo la parte visible (recortada por scroll areas y padres)
+                visible = button.visibleRegion().boundingRect()
+                if visible.isEmpty():
+                    continue
+                origin = button.mapToGlobal(visible.topLeft())
+                targets.append((button, (origin.x(), origin.y(),
+                                         origin.x() + visible.width(), origin.y() + visible.height())))
+        return targets
+
+    def rebuild(self):
+        self.targets = self._collect()
+        self.rects = dict(self.targets)
+        r = self.snap_radius
+        boxes = [(left - r, top - r, right + r, bottom + r) for _, (left, top, right, bottom) in self.targets]
+
+        self.xs = sorted({x for box in boxes for x in (box[0], box[2])})
+        self.columns = []
+        for x0, x1 in zip(self.xs, self.xs[1:]):
+            inside = [i for i, box in enumerate(boxes) if box[0] <= x0 and x1 <= box[2]]
+            ys = sorted({y for i in inside for y in (boxes[i][1], boxes[i][3])})
+            rows = [tuple(i for i in inside if boxes[i][1] <= y0 and y1 <= boxes[i][3])
+                    for y0, y1 in zip(ys, ys[1:])]
+            self.columns.append((ys, rows))
+        self.dirty = False
+        self.rebuilds += 1
+
+    def _candidates(self, x, y):
+        column = bisect_right(self.xs, x) - 1
+        if not 0 <= column < len(self.columns):
+            return ()
+        ys, rows = self.columns[column]
+        row = bisect_right(ys, y) - 1
+        if not 0 <= row < len(rows):
+            return ()
+        return rows[row]
+
+    def find(self, point):
+        """Button at (or within snap_radius of) a global QPoint, or None."""
+        if self.dirty:
+            self.rebuild()
+        x, y = point.x(), point.y()
+        best, best_distance = None, None
+        for i in self._candidates(x, y):
+            button, (left, top, right, bottom) = self.targets[i]
+            dx = max(left - x, 0, x - right + 1)
+            dy = max(top - y, 0, y - bottom + 1)
+            distance = dx * dx + dy * dy
+            # Con solapes gana el último en la lista (los overlays van después)
+            if best is None or distance <= best_distance:
+                best, best_distance = button, distance
+        if best is not None and best_distance > self.snap_radius ** 2:
+            return None  # en la esquina del rectángulo inflado, fuera del radio
+        return best
+
+
+class HoverHighlight(QWidget):
+    """
+    Transparent overlay that draws the hover selection around a target.
+    Only the rectangles of the previous and the new target are repainted,
+    and only when the target (or its rectangle) changes: a steady hover does
+    no style or paint work, unlike toggling a stylesheet property.
+    """
+    BORDER = 4
+    COLOR = QColor(0, 161, 255)
+    FILL = QColor(255, 255, 255, 40)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.setAttribute(Qt.WidgetAttribute.WA_NoSystemBackground)
+        self.target = QRect()  # local rectangle of the highlighted button
+
+    def show_target(self, global_rect):
+        """Highlight a global (left, top, right, bottom) rectangle, or nothing with None."""
+        target = QRect()
+        if global_rect is not None:
+            left, top, right, bottom = global_rect
+            target = QRect(self.mapFromGlobal(QPoint(left, top)), QSize(right - left, bottom - top))
+        if target == self.target:
+            return
+        previous, self.target = self.target, target
+        margin = self.BORDER
+        for rect in (previous, target):
+            if not rect.isNull():
+                self.update(rect.adjusted(-margin, -margin, margin, margin))
+
+    def paintEvent(self, event):
+        if self.target.isNull():
+            return
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(QPen(self.COLOR, self.BORDER))
+        painter.setBrush(self.FILL)
+        # El borde se dibuja centrado en el contorno del botón
+        inset = self.BORDER // 2
+        painter.drawRoundedRect(self.target.adjusted(inset, inset, -inset, -inset), 10, 10)
@@ -0,0 +1,187 @@
+"""
+Grabación y replay de trazas de landmarks.
+
+Una traza es un único .npy con un registro por frame (ver TRACE_DTYPE), que se
+abre con np.load(mmap_mode="r") sin copiarlo a memoria. El replay alimenta la
+máquina de estados de HandDetector directamente, sin cv2 ni mediapipe:
+
+    python -m app.traces record --video sesion.mp4 sesion.npy
+    python -m app.traces replay sesion.npy
+    python -m app.traces replay sesion.npy --config config.ini
+
+check compara los eventos discretos del replay (todo menos hover) con los
+esperados en un .json, para pruebas de regresión de la lógica de gestos:
+
+    python -m app.traces check benchmarks/traces/gestures.npy benchmarks/traces/gestures.json
+"""
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from app.vision import HandDetector
+
+MAX_TRACE_HANDS = 2
+
+TRACE_DTYPE = np.dtype([
+    ("timestamp", "f8"),                                   # seconds, capture clock
+    ("size", "u2", (2,)),                                  # frame width, height
+    ("hands", "u1"),                                       # valid entries in landmarks
+    ("landmarks", "f4", (MAX_TRACE_HANDS, 21, 3)),         # MediaPipe normalized x, y, z
+])
+
+
+class TraceRecorder:
+    """Collects per-frame landmarks and writes them as a trace on close()"""
+    def __init__(self, path):
+        self.path = path
+        self._chunks = []
+        self._chunk = np.zeros(1024, dtype=TRACE_DTYPE)
+        self._count = 0
+
+    def append(self, timestamp, hand_landmarks, width, height):
+        """Add one frame; hand_landmarks is (n_hands, 21, 3) normalized."""
+        if self._count == len(self._chunk):
+            self._chunks.append(self._chunk)
+            self._chunk = np.zeros(len(self._chunk), dtype=TRACE_DTYPE)
+            self._count = 0
+        record = self._chunk[self._count]
+        hands = min(len(hand_landmarks), MAX_TRACE_HANDS)
+        record["timestamp"] = timestamp
+        record["size"] = (width, height)
+        record["hands"] = hands
+        record["landmarks"][:hands] = hand_landmarks[:hands]
+        self._count += 1
+
+    def close(self):
+        trace = np.concatenate(self._chunks + [self._chunk[:self._count]])
+        np.save(self.path, trace)
+        return len(trace)
+
+
+def load_trace(path):
+    """Open a trace memory-mapped (read-only, no copy)."""
+    trace = np.load(path, mmap_mode="r")
+    if trace.dtype != TRACE_DTYPE:
+        raise ValueError(f"{path} no es una traza de landmarks")
+    return trace
+
+
+def replay(trace, detector=None):
+    """
+    Feed a trace into the gesture state machine.
+    Yields (frame_index, timestamp, events) for every frame.
+    """
+    if detector is None:
+        detector = HandDetector(backend=None)
+    for i, record in enumerate(trace):
+        timestamp = float(record["timestamp"])
+        width, height = record["size"]
+        detector.update_hands(record["landmarks"][:record["hands"]], width, height, timestamp)
+        yield i, timestamp, detector.detect_gestures()
+
+
+def discrete_events(trace, detector=None):
+    """[frame, kind, value] for every non-hover event of a replay."""
+    return [[i, kind, value] for i, _, events in replay(trace, detector)
+            for kind, value in events if kind != "hover"]
+
+
+def check(trace, expected, detector=None):
+    """Compare a replay with expected [frame, kind, value] events; returns the differences."""
+    unexpected = discrete_events(trace, detector)
+    missing = []
+    for event in expected:
+        if event in unexpected:
+            unexpected.remove(event)  # cada esperado consume un solo evento real
+        else:
+            missing.append(event)
+    return missing, unexpected
+
+
+def record_source(source, path, detector=None):
+    """Run inference on every frame of a finite FrameSource and save the trace."""
+    if detector is None:
+        detector = HandDetector()
+    recorder = TraceRecorder(path)
+    if not source.open():
+        raise IOError("No se pudo abrir la fuente de video")
+    try:
+        while True:
+            frame = source.read()
+            if frame is None:
+                if source.exhausted:
+                    break
+                continue
+            detector.find_hands(frame.image, draw=False)
+            h, w = frame.image.shape[:2]
+            recorder.append(frame.timestamp, detector.hand_landmarks, w, h)
+    finally:
+        source.close()
+    return recorder.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grabación y replay de trazas de landmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="grabar una traza desde un video o imágenes")
+    rec.add_argument("--video", help="archivo de video")
+    rec.add_argument("--images", help="patrón glob de imágenes")
+    rec.add_argument("--fps", type=float, default=30.0)
+    rec.add_argument("output")
+
+    rep = sub.add_parser("replay", help="reproducir una traza por la máquina de gestos")
+    rep.add_argument("trace")
+    rep.add_argument("--quiet", action="store_true", help="no listar eventos")
+    rep.add_argument("--config", help="config.ini con [GestureRules]/[GestureThresholds] a probar")
+
+    chk = sub.add_parser("check", help="comparar los eventos del replay con los esperados")
+    chk.add_argument("trace")
+    chk.add_argument("expected", help=".json con la lista de [frame, tipo, valor] esperados")
+
+    args = parser.parse_args()
+    if args.command == "record":
+        from app.capture import ImageSequenceSource, VideoFileSource
+        # realtime=False: tan rápido como se decodifique, con reloj virtual index/fps
+        if args.video:
+            source = VideoFileSource(args.video, realtime=False, fps=args.fps, width=0, height=0)
+        else:
+            source = ImageSequenceSource(args.images, realtime=False, fps=args.fps, width=0, height=0)
+        frames = record_source(source, args.output)
+        print(f"{frames} frames guardados en {args.output}")
+    elif args.command == "check":
+        with open(args.expected, encoding="utf-8") as f:
+            expected = json.load(f)
+        missing, unexpected = check(load_trace(args.trace), expected)
+        for event in missing:
+            print(f"falta:     {event}")
+        for event in unexpected:
+            print(f"inesperado: {event}")
+        if missing or unexpected:
+            sys.exit(1)
+        print(f"{len(expected)} eventos como se esperaba")
+    else:
+        trace = load_trace(args.trace)
+        detector = None
+        if args.config:
+            import configparser
+            from app.gestures import GestureEngine
+            config = configparser.ConfigParser()
+            config.read(args.config)
+            detector = HandDetector(backend=None, engine=GestureEngine.from_config(config))
+        start = time.perf_counter()
+        total = 0
+        for i, timestamp, events in replay(trace, detector):
+            for kind, value in events:
+                total += 1
+                if not args.quiet and kind != "hover":
+                    print(f"{i:6d} {timestamp:9.3f}s {kind} {value if value is not None else ''}")
+        elapsed = time.perf_counter() - start
+        print(f"{len(trace)} frames, {total} eventos, {len(trace) / elapsed:.0f} frames/s")
+
+
+if __name__ == "__main__":
+    main()
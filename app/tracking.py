@@ -0,0 +1,97 @@
+import numpy as np
+
+
+class LandmarkTracker:
+    """
+    Constant-velocity Kalman filter over the 21 normalized hand landmarks
+    (x, y, z), used to predict the hand between MediaPipe runs.
+
+    Every coordinate follows the same motion model and shares the same time
+    steps, so one 2x2 covariance is valid for all 63 of them: prediction and
+    correction are a handful of vectorized operations on (21, 3) arrays.
+    """
+    def __init__(self, max_predicted=2, max_error=0.25, process_noise=1.0, measurement_noise=0.003):
+        self.max_predicted = max_predicted  # consecutive predicted frames (0 disables)
+        self.max_error = max_error          # predicted std / last error, in hand sizes
+        self.q = process_noise              # acceleration noise ((units/s²)²·s)
+        self.r = measurement_noise ** 2     # landmark jitter variance
+
+        self.position = None  # (21, 3) normalized
+        self.velocity = np.zeros((21, 3), dtype=np.float64)
+        self.P = np.zeros((2, 2))
+        self.timestamp = None
+        self.size = np.ones(2)  # frame width, height: errors are measured in pixels
+        self.hand_scale = 0.0   # wrist -> middle MCP (px), for errors in hand sizes
+        self.predicted = 0      # frames predicted since the last measurement
+        self.last_error = 0.0   # error of the last prediction vs. measurement, in hand sizes
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            max_predicted=config.getint("Performance", "PredictFrames", fallback=2),
+            max_error=config.getfloat("Performance", "PredictMaxError", fallback=0.25),
+        )
+
+    @property
+    def tracking(self):
+        return self.position is not None
+
+    def reset(self):
+        self.position = None
+        self.predicted = 0
+
+    def _propagate(self, dt):
+        # Posición y covarianza llevadas hasta dt segundos después
+        position = self.position + self.velocity * dt
+        F = np.array([[1.0, dt], [0.0, 1.0]])
+        Q = self.q * np.array([[dt ** 3 / 3, dt ** 2 / 2], [dt ** 2 / 2, dt]])
+        return position, F @ self.P @ F.T + Q
+
+    def confident(self, timestamp):
+        """True if landmarks at timestamp can be predicted instead of inferred."""
+        if not self.tracking or self.predicted >= self.max_predicted or self.hand_scale <= 0:
+            return False
+        if self.last_error > self.max_error:
+            return False  # la última predicción ya falló: movimiento brusco
+        _, P = self._propagate(timestamp - self.timestamp)
+        return np.sqrt(P[0, 0]) * self.size.max() / self.hand_scale <= self.max_error
+
+    def predict(self, timestamp):
+        """(21, 3) float32 normalized landmarks extrapolated to timestamp."""
+        position, self.P = self._propagate(timestamp - self.timestamp)
+        self.position, self.timestamp = position, timestamp
+        self.predicted += 1
+        return position.astype(np.float32)
+
+    def update(self, landmarks, timestamp, width, height):
+        """Correct with measured (21, 3) normalized landmarks, or None if the hand was lost."""
+        if landmarks is None:
+            self.reset()
+            return
+        landmarks = landmarks.astype(np.float64)
+        self.size = np.array((width, height), dtype=np.float64)
+        self.hand_scale = float(np.linalg.norm((landmarks[9, :2] - landmarks[0, :2]) * self.size))
+        if self.tracking and timestamp <= self.timestamp:
+            self.reset()  # reloj reiniciado (otra fuente, replay): empezar de nuevo
+        if not self.tracking:
+            self.position = landmarks
+            self.velocity[:] = 0.0
+            self.P = np.array([[self.r, 0.0], [0.0, 1.0]])
+            self.timestamp = timestamp
+            self.last_error = 0.0
+            return
+
+        position, P = self._propagate(timestamp - self.timestamp)
+        innovation = landmarks - position
+        if self.hand_scale > 0:
+            error_px = np.linalg.norm(innovation[:, :2] * self.size, axis=1).mean()
+            self.last_error = float(error_px) / self.hand_scale
+
+        # Ganancia de Kalman (igual para las 63 coordenadas)
+        S = P[0, 0] + self.r
+        K = P[:, 0] / S
+        self.position = position + K[0] * innovation
+        self.velocity = self.velocity + K[1] * innovation
+        self.P = P - np.outer(K, P[0, :])
+        self.timestamp = timestamp
+        self.predicted = 0
@@ -1,11 +1,19 @@
-import cv2
-import numpy as np
 import requests
-from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
+from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QPushButton, QLabel, QStackedWidget, QMessageBox)
-from PyQt6.QtCore import Qt, QTimer, QPoint, pyqtSignal, QPropertyAnimation, QEasingCurve, QThread, QObject
-from PyQt6.QtGui import QImage, QPixmap, QCursor, QPainter, QColor, QPen, QIcon
-from app.vision import HandDetector
+from PyQt6.QtCore import Qt, QTimer, QPoint, QPointF, QRect, pyqtSignal, QPropertyAnimation, QEasingCurve, QThread, QObject
+from PyQt6.QtGui import QPixmap, QCursor, QPainter, QColor, QPen, QIcon
+from app.capture import create_frame_source
+from app.events import GestureChannel, GestureKind
+from app.filters import CursorFilter
+from app.gestures import GestureEngine
+from app.governor import IdleGovernor, LoadGovernor
+from app.mapping import CoordinateMapper
+from app.render import FrameBuffers, VideoView
+from app.targets import HoverHighlight, TargetIndex
+from app.tracking import LandmarkTracker
+from app.vision import HandDetector, RoiTracker
+from app.workers.camera_worker import CameraWorker
 from app.database import create_patient_table
 from app.utils.paths import resource_path  # <--- IMPORTANTE: GPS de archivos
 
@@ -45,57 +53,93 @@ class DniApiWorker(QObject):
 
 
 class VirtualCursor(QWidget):
-    """Virtual cursor overlay for visual feedback"""
-    def __init__(self, parent=None):
+    """
+    Virtual cursor overlay for visual feedback.
+    The ring and dot are pre-rendered into small pixmaps (one per click
+    animation step) and a move only repaints the old and new cursor
+    rectangles; the animation timer runs only while a click animates.
+    """
+    CLICK_STEPS = 10
+    DOT_RADIUS = 5
+    PEN_WIDTH = 3
+
+    def __init__(self, parent=None, cursor_size=30):
         super().__init__(parent)
         self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint | Qt.WindowType.Tool)
         
         self.cursor_pos = QPoint(0, 0)
-        self.cursor_size = 30
+        self.cursor_size = cursor_size
         self.is_clicking = False
         self.click_animation = 0
+        self._pixmaps = {}  # (is_clicking, click_animation) -> QPixmap
+        # Lado del pixmap: el anillo más grande de la animación más el trazo
+        self._extent = cursor_size + self.CLICK_STEPS * 2 + self.PEN_WIDTH + 2
         
-        # Animation timer
-        self.animation_timer = QTimer()
+        # Animation timer: solo activo durante la animación del click
+        self.animation_timer = QTimer(self)
         self.animation_timer.timeout.connect(self.animate)
-        self.animation_timer.start(30)
         
+    def _cursor_rect(self, pos=None):
+        pos = self.cursor_pos if pos is None else pos
+        half = self._extent // 2
+        return QRect(pos.x() - half, pos.y() - half, self._extent, self._extent)
+
+    def _pixmap(self):
+        key = (self.is_clicking, self.click_animation)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is None:
+            ratio = self.devicePixelRatioF()
+            pixmap = QPixmap(int(self._extent * ratio), int(self._extent * ratio))
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            center = QPointF(self._extent / 2, self._extent / 2)
+
+            # Draw outer ring
+            size = self.cursor_size + self.click_animation * 2
+            color = QColor(0, 255, 0) if self.is_clicking else QColor(0, 255, 255)
+            painter.setPen(QPen(color, self.PEN_WIDTH))
+            painter.setBrush(QColor(color.red(), color.green(), color.blue(), 50))
+            painter.drawEllipse(center, size // 2, size // 2)
+
+            # Draw center dot
+            painter.setBrush(color)
+            painter.drawEllipse(center, self.DOT_RADIUS, self.DOT_RADIUS)
+            painter.end()
+            self._pixmaps[key] = pixmap
+        return pixmap
+
     def update_position(self, x, y):
-        self.cursor_pos = QPoint(x, y)
-        self.update()
+        pos = QPoint(x, y)
+        if pos == self.cursor_pos:
+            return
+        self.update(self._cursor_rect())  # posición anterior
+        self.cursor_pos = pos
+        self.update(self._cursor_rect())
         
     def set_clicking(self, clicking):
         self.is_clicking = clicking
         if clicking:
-            self.click_animation = 10
-        self.update()
+            self.click_animation = self.CLICK_STEPS
+            self.animation_timer.start(30)
+        self.update(self._cursor_rect())
         
     def animate(self):
         if self.click_animation > 0:
             self.click_animation -= 1
-            self.update()
+            self.update(self._cursor_rect())
+        if self.click_animation == 0:
+            self.animation_timer.stop()
     
     def paintEvent(self, event):
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
-        # Draw outer ring
-        size = self.cursor_size + self.click_animation * 2
-        color = QColor(0, 255, 0) if self.is_clicking else QColor(0, 255, 255)
-        
-        pen = QPen(color, 3)
-        painter.setPen(pen)
-        painter.setBrush(QColor(color.red(), color.green(), color.blue(), 50))
-        painter.drawEllipse(self.cursor_pos, size//2, size//2)
-        
-        # Draw center dot
-        painter.setBrush(color)
-        painter.drawEllipse(self.cursor_pos, 5, 5)
+        painter.drawPixmap(self._cursor_rect().topLeft(), self._pixmap())
 
 class CameraWidget(QWidget):
-    gesture_detected = pyqtSignal(str, object)
+    gesture_detected = pyqtSignal(object)  # app.events.GestureEvent
 
     def __init__(self):
         super().__init__()
@@ -109,76 +153,90 @@ class CameraWidget(QWidget):
         max_hands = config.getint("GestureDetection", "MaxHands", fallback=1)
         min_detection_confidence = config.getfloat("GestureDetection", "MinDetectionConfidence", fallback=0.85)
         min_tracking_confidence = config.getfloat("GestureDetection", "MinTrackingConfidence", fallback=0.85)
+        inference_mode = config.get("GestureDetection", "InferenceMode", fallback="thread")
+        backend = config.get("GestureDetection", "Backend", fallback="solutions")
+        model = config.get("GestureDetection", "Model", fallback="full")
+        model_paths = {name: config.get("GestureDetection", key, fallback=HandDetector.TASKS_MODELS[name])
+                       for name, key in (("full", "TasksModelFull"), ("lite", "TasksModelLite"))}
+        # El gobernador de carga solo cambia a un modelo más ligero si existe
+        models = [model]
+        if model == "full" and (backend != "tasks" or os.path.exists(resource_path(model_paths["lite"]))):
+            models.append("lite")
+        ring_slots = config.getint("GestureDetection", "ProcessRingSlots", fallback=2)
+        trace_path = config.get("Recording", "LandmarkTrace", fallback="")
+        roi = None
+        if config.getboolean("Performance", "RoiTracking", fallback=True):
+            roi = RoiTracker(margin=config.getfloat("Performance", "RoiMargin", fallback=0.3),
+                             size=config.getint("Performance", "RoiSize", fallback=256),
+                             full_frame_interval=config.getint("Performance", "RoiFullFrameInterval", fallback=30))
+        cursor_filter = None
+        if config.getboolean("Cursor", "Smoothing", fallback=True):
+            cursor_filter = CursorFilter.from_config(config)
+        tracker = None
+        if config.getint("Performance", "PredictFrames", fallback=2) > 0:
+            tracker = LandmarkTracker.from_config(config)
         
         # Config de UI
         self.show_landmarks_only = config.getboolean("UI", "show_landmarks_only", fallback=False)
 
-        # Configuración de la cámara y detector de manos
-        self.cap = cv2.VideoCapture(0, cv2.CAP_DSHOW)
-        self.detector = HandDetector(max_hands=max_hands, 
-                                     detection_con=min_detection_confidence, 
-                                     track_con=min_tracking_confidence)
-
-        # Etiqueta para mostrar el video
-        self.camera_label = QLabel()
-        self.camera_label.setStyleSheet("border: 2px solid red;")
+        # Vista de video: pinta directamente los buffers que llena el worker
+        self.buffers = FrameBuffers()
+        self.video_view = VideoView(self.buffers, landmarks_only=self.show_landmarks_only)
+        self.status_label = QLabel(self.video_view)
+        self.status_label.hide()
         layout = QVBoxLayout()
-        layout.addWidget(self.camera_label)
+        layout.addWidget(self.video_view)
         layout.setContentsMargins(0, 0, 0, 0)
         self.setLayout(layout)
 
-        # Temporizador para actualizar el frame
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_frame)
-        self.timer.start(30)
+        # Cámara, inferencia y gestos corren en su propio hilo;
+        # aquí solo se pinta el frame y se reenvían los eventos
+        self.thread = QThread()
+        self.channel = GestureChannel()
+        self.worker = CameraWorker(max_hands=max_hands,
+                                   detection_con=min_detection_confidence,
+                                   track_con=min_tracking_confidence,
+                                   show_landmarks_only=self.show_landmarks_only,
+                                   source=create_frame_source(config),
+                                   inference_mode=inference_mode,
+                                   ring_slots=ring_slots,
+                                   trace_path=trace_path or None,
+                                   governor=IdleGovernor.from_config(config),
+                                   roi=roi,
+                                   engine=GestureEngine.from_config(config),
+                                   tracker=tracker,
+                                   cursor_filter=cursor_filter,
+                                   buffers=self.buffers,
+                                   backend=backend,
+                                   model=model,
+                                   model_paths=model_paths,
+                                   load_governor=LoadGovernor.from_config(config, models),
+                                   channel=self.channel)
+        self.worker.moveToThread(self.thread)
+        self.thread.started.connect(self.worker.run)
+        self.worker.frame_ready.connect(self.video_view.update)
+        self.channel.ready.connect(self.deliver_gestures)
+        self.worker.error.connect(self.show_error)
+        self.thread.start()
 
-    def update_frame(self):
-        success, img = self.cap.read()
-        if not success:
-            return
+    def show_error(self, message):
+        self.status_label.setText(message)
+        self.status_label.adjustSize()
+        self.status_label.move(10, 10)
+        self.status_label.show()
 
-        # Procesar la imagen para encontrar manos, pero no dibujar todavía
-        processed_img = self.detector.find_hands(img, draw=False)
-        lm_list = self.detector.find_position(processed_img)
-
-        # Lógica de detección de gestos (no cambia)
-        if len(lm_list) != 0:
-            hover_pos = self.detector.get_hover_position()
-            if hover_pos:
-                self.gesture_detected.emit("hover", {"x": hover_pos[0], "y": hover_pos[1]})
-            if self.detector.is_fist():
-                self.gesture_detected.emit("fist", {})
-            if self.detector.detect_peace_sign():
-                self.gesture_detected.emit("peace", {})
-            swipe_gesture = self.detector.detect_swipe()
-            if swipe_gesture:
-                self.gesture_detected.emit("swipe", {"direction": swipe_gesture})
-        else:
-            self.detector.reset_state()
-
-        # Preparar la imagen final para mostrar
-        display_img = None
-        if self.show_landmarks_only:
-            # Crear un lienzo negro y dibujar solo los landmarks
-            display_img = np.zeros_like(img)
-            if self.detector.results.multi_hand_landmarks:
-                for hand_lms in self.detector.results.multi_hand_landmarks:
-                    self.detector.mp_draw.draw_landmarks(
-                        display_img, hand_lms, self.detector.mp_hands.HAND_CONNECTIONS)
-        else:
-            # Dibujar sobre la imagen original
-            display_img = self.detector.find_hands(img, draw=True)
+    def deliver_gestures(self):
+        # Hilo de la GUI: todos los gestos pendientes, el hover solo el último
+        for event in self.channel.drain():
+            self.gesture_detected.emit(event)
 
-        # Convertir y mostrar la imagen final
-        display_img = cv2.flip(display_img, 1)
-        img_rgb = cv2.cvtColor(display_img, cv2.COLOR_BGR2RGB)
-        h, w, ch = img_rgb.shape
-        bytes_per_line = ch * w
-        qt_image = QImage(img_rgb.data, w, h, bytes_per_line, QImage.Format.Format_RGB888)
-        self.camera_label.setPixmap(QPixmap.fromImage(qt_image))
+    def stop(self):
+        self.worker.stop()
+        self.thread.quit()
+        self.thread.wait()
 
     def closeEvent(self, event):
-        self.cap.release()
+        self.stop()
         event.accept()
 # ==================== ESTILOS ====================
 STYLE_SHEET = """
@@ -202,11 +260,6 @@ STYLE_SHEET = """
         border: 2px solid #FFFFFF;
     }
 
-    QPushButton#RoleCard[selected="true"] {
-        border: 4px solid #00A1FF;
-        background-color: #2A2A2A;
-    }
-    
     /* Estilo para el botón de ayuda */
     QPushButton#HelpButton {
         background-color: #1C1C1C;
@@ -243,11 +296,6 @@ STYLE_SHEET = """
         background-color: #2A2A2A;
     }
 
-    QPushButton[selected="true"] {
-        border: 4px solid #00A1FF;
-        background-color: #888888;
-    }
-    
     QPushButton#btnSecondary {
         background-color: #888888;
         color: #000000;
@@ -375,6 +423,19 @@ class MainWindow(QMainWindow):
         self.setGeometry(100, 100, 1400, 750)
         self.setStyleSheet(STYLE_SHEET)
 
+        config = configparser.ConfigParser()
+        config.read(resource_path("config.ini"))
+
+        # Cámara (normalizada) -> píxeles globales; se recalcula solo al
+        # mover/redimensionar la ventana o cambiar de pantalla
+        self.hover_mapper = CoordinateMapper.from_config(config)
+        self.hover_area = config.get("UI", "HoverTarget", fallback="screen")
+        self._watched_screen = None
+
+        # Botones seleccionables con hover, indexados por su rectángulo global
+        self.hover_targets = TargetIndex(
+            snap_radius=config.getint("UI", "HoverSnapRadius", fallback=40), parent=self)
+
         # Layout principal
         main_layout = QHBoxLayout()
         
@@ -401,6 +462,7 @@ class MainWindow(QMainWindow):
 
         # Iniciar en la página de bienvenida
         self.stacked_widget.setCurrentWidget(self.pages["welcome"])
+        self.stacked_widget.currentChanged.connect(self.update_hover_targets)
 
         # Widget de la cámara
         self.camera_widget = CameraWidget()
@@ -444,10 +506,15 @@ class MainWindow(QMainWindow):
         self.feedback_timer.setSingleShot(True)
         self.feedback_timer.timeout.connect(self.feedback_label.hide)
         
+        # Resaltado del botón seleccionado con hover (sobre las páginas)
+        self.hover_highlight = HoverHighlight(self)
+        self.hover_highlight.setGeometry(0, 0, self.width(), self.height())
+        self.hover_highlight.show()
+
         # Virtual cursor for better feedback
         self.virtual_cursor = None
         if sys.platform == 'win32':
-            self.virtual_cursor = VirtualCursor(self)
+            self.virtual_cursor = VirtualCursor(self, cursor_size=config.getint("UI", "CursorSize", fallback=30))
             self.virtual_cursor.setGeometry(0, 0, self.width(), self.height())
             self.virtual_cursor.show()
             self.virtual_cursor.raise_()
@@ -471,14 +538,53 @@ class MainWindow(QMainWindow):
         self.toast_timer = QTimer()
         self.toast_timer.setSingleShot(True)
         self.toast_timer.timeout.connect(self.hide_toast)
+        self.update_hover_targets()
     
+    def update_hover_targets(self):
+        """Index the buttons of the current page plus the help button."""
+        self.hover_targets.set_roots(self.stacked_widget.currentWidget(), self.help_button)
+        self.selected_button = None
+        self.hover_highlight.show_target(None)
+
+    def closeEvent(self, event):
+        # Detener el hilo de la cámara antes de cerrar
+        self.camera_widget.stop()
+        super().closeEvent(event)
+
+    def update_hover_mapper(self):
+        """Map hover onto the current screen, or onto this window."""
+        screen = self.screen()
+        if screen is not self._watched_screen:
+            if self._watched_screen is not None:
+                self._watched_screen.geometryChanged.disconnect(self.update_hover_mapper)
+            screen.geometryChanged.connect(self.update_hover_mapper)
+            self._watched_screen = screen
+        area = self.geometry() if self.hover_area == "window" else screen.geometry()
+        self.hover_mapper.set_target((area.x(), area.y(), area.width(), area.height()))
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._watched_screen is None:
+            self.windowHandle().screenChanged.connect(self.update_hover_mapper)
+        self.update_hover_mapper()
+
+    def moveEvent(self, event):
+        super().moveEvent(event)
+        self.hover_targets.invalidate()  # los rectángulos indexados son globales
+        if self.hover_area == "window":
+            self.update_hover_mapper()
+
     def resizeEvent(self, event):
         super().resizeEvent(event)
+        self.hover_targets.invalidate()
+        if self.hover_area == "window":
+            self.update_hover_mapper()
         # Mover el label de feedback
         self.feedback_label.move(
             int((self.width() - self.feedback_label.width()) / 2), 
             int((self.height() - self.feedback_label.height()) / 2)
         )
+        self.hover_highlight.setGeometry(0, 0, self.width(), self.height())
         # Mover el cursor virtual
         if self.virtual_cursor:
             self.virtual_cursor.setGeometry(0, 0, self.width(), self.height())
@@ -490,6 +596,7 @@ class MainWindow(QMainWindow):
             self.height() - self.help_button.height() - margin
         )
         self.help_button.raise_()
+        self.hover_highlight.raise_()
     def show_toast(self, message, duration=3000):
         if self.toast_widget:
             self.toast_widget.close()
@@ -631,68 +738,54 @@ class MainWindow(QMainWindow):
             # Reset DNI page to allow re-entry
             self.pages["dni_input"].reset()
 
-    def handle_gesture(self, gesture_type, data):
+    def handle_gesture(self, event):
+        kind = event.kind
         # Hover has no cooldown - it's continuous
-        if gesture_type == "hover":
-            self.handle_hover_gesture(data["x"], data["y"])
+        if kind is GestureKind.HOVER:
+            self.handle_hover_gesture(event.x, event.y)
             return
         
         # Other gestures respect cooldown
-        if self.gesture_cooldown_timer.isActive() and gesture_type != "fist":
+        if self.gesture_cooldown_timer.isActive() and kind is not GestureKind.CLICK:
             return
 
-        if gesture_type == "fist":
+        if kind is GestureKind.CLICK:
             self.show_feedback("👊 CLICK", 500)
             if self.virtual_cursor:
                 self.virtual_cursor.set_clicking(True)
                 QTimer.singleShot(200, lambda: self.virtual_cursor.set_clicking(False))
             self.handle_fist_gesture()
             
-        elif gesture_type == "swipe":
-            direction_emoji = "➡️" if data["direction"] == "right" else "⬅️"
+        elif kind is GestureKind.SWIPE:
+            direction_emoji = {"right": "➡️", "left": "⬅️", "up": "⬆️", "down": "⬇️"}[event.direction]
             self.show_feedback(direction_emoji)
-            self.handle_swipe_gesture(data["direction"])
+            self.handle_swipe_gesture(event.direction)
             self.gesture_cooldown_timer.start(500)
             
             
-        elif gesture_type == "peace":
+        elif kind is GestureKind.BACK:
             self.show_feedback("✌️ ATRÁS")
             self.handle_back_gesture()
             self.gesture_cooldown_timer.start(800)
 
     def handle_hover_gesture(self, x, y):
-        screen_width = QApplication.primaryScreen().size().width()
-        screen_height = QApplication.primaryScreen().size().height()
-        
-        # Map camera coordinates to screen coordinates
-        global_x = int(np.interp(x, [0, 640], [0, screen_width]))
-        global_y = int(np.interp(y, [0, 480], [0, screen_height]))
+        # Map normalized camera coordinates to screen coordinates
+        global_x, global_y = self.hover_mapper.map(x, y)
         
         # Update virtual cursor position
         if self.virtual_cursor:
             self.virtual_cursor.update_position(global_x, global_y)
 
-        widget = QApplication.widgetAt(QPoint(global_x, global_y))
-
-        button = None
-        if isinstance(widget, QPushButton):
-            button = widget
-        elif widget and isinstance(widget.parent(), QPushButton):
-            button = widget.parent()
+        button = self.hover_targets.find(QPoint(global_x, global_y))
 
-        # Deselect previous button
-        if self.selected_button and self.selected_button != button:
-            self.selected_button.setProperty("selected", False)
-            self.selected_button.style().unpolish(self.selected_button)
-            self.selected_button.style().polish(self.selected_button)
+        # El overlay solo repinta si cambia el botón o su rectángulo
+        self.hover_highlight.show_target(self.hover_targets.rects.get(button))
+        if button is self.selected_button:
+            return
 
-        # Select new button
+        # Entrada en un botón nuevo (o salida de todos)
         self.selected_button = button
         if self.selected_button:
-            self.selected_button.setProperty("selected", True)
-            self.selected_button.style().unpolish(self.selected_button)
-            self.selected_button.style().polish(self.selected_button)
-            
             # Start stable hover timer (for future enhancements)
             self.hover_stable_timer.start(500)
     
@@ -704,13 +797,12 @@ class MainWindow(QMainWindow):
     def handle_fist_gesture(self):
         """Handle fist/click gesture - works independently of other cooldowns"""
         if self.selected_button and not self.fist_cooldown_timer.isActive():
-            # Visual feedback
-            self.selected_button.setProperty("selected", False)
-            self.selected_button.style().unpolish(self.selected_button)
-            self.selected_button.style().polish(self.selected_button)
+            # Visual feedback: el próximo hover vuelve a seleccionarlo
+            button, self.selected_button = self.selected_button, None
+            self.hover_highlight.show_target(None)
             
             # Trigger click
-            self.selected_button.click()
+            button.click()
             self.fist_cooldown_timer.start(800)  # Prevent rapid double-clicks
 
     def handle_swipe_gesture(self, direction):
@@ -1,23 +1,243 @@
-import cv2
-import mediapipe as mp
+import os
+import threading
+import time
+
 import numpy as np
-from collections import deque
+from dataclasses import dataclass
 
-class HandDetector:
-    def __init__(self, max_hands=1, detection_con=0.85, track_con=0.85):
-        import os, sys
-        base_dir = getattr(sys, '_MEIPASS', os.path.abspath("."))
-        mp_path = os.path.join(base_dir, "mediapipe", "modules")
-        os.environ["MEDIAPIPE_MODEL_PATH"] = mp_path
-
-        self.mp_hands = mp.solutions.hands
-        self.hands = self.mp_hands.Hands(
-            max_num_hands=max_hands,
-            min_detection_confidence=detection_con,
-            min_tracking_confidence=track_con
-        )
-        self.mp_draw = mp.solutions.drawing_utils
-        self.tip_ids = [4, 8, 12, 16, 20]
+from app.gestures import GestureEngine
+from app.motion import LandmarkHistory
+from app.utils.paths import resource_path
+
+try:
+    import cv2
+    import mediapipe as mp
+except ImportError:
+    # El replay de trazas (app.traces) solo necesita numpy
+    cv2 = mp = None
+
+# Máscara de dedos: bit 0 = pulgar ... bit 4 = meñique
+THUMB, INDEX, MIDDLE, RING, PINKY = (1 << i for i in range(5))
+MASK_POINTING = INDEX
+MASK_PEACE = INDEX | MIDDLE
+MASK_FOUR_FINGERS = INDEX | MIDDLE | RING | PINKY
+MASK_OPEN_HAND = THUMB | MASK_FOUR_FINGERS
+
+TIP_IDS = np.array([8, 12, 16, 20])   # index..pinky tips
+PIP_IDS = TIP_IDS - 2
+FINGER_BITS = np.array([INDEX, MIDDLE, RING, PINKY])
+
+NO_HANDS = np.empty((0, 21, 3), dtype=np.float32)
+
+# Geometría relativa al tamaño de la mano (muñeca -> nudillo del medio), así
+# el mismo gesto da el mismo resultado a 320x240, 640x480 o con recorte ROI
+FINGER_EXTEND_RATIO = 0.17  # tip above pip by this fraction (≈15 px at 640x480)
+THUMB_RATIO = 1.3           # thumb tip vs thumb base distance from the wrist
+
+# Topología de la mano de MediaPipe (igual a mp.solutions.hands.HAND_CONNECTIONS)
+HAND_CONNECTIONS = np.array([
+    (0, 1), (1, 2), (2, 3), (3, 4),
+    (0, 5), (5, 6), (6, 7), (7, 8),
+    (5, 9), (9, 10), (10, 11), (11, 12),
+    (9, 13), (13, 14), (14, 15), (15, 16),
+    (13, 17), (0, 17), (17, 18), (18, 19), (19, 20),
+])
+
+SWIPE_LABELS = {
+    "right": "Swipe Right ➡",
+    "left": "Swipe Left ⬅",
+    "up": "Swipe Up ⬆",
+    "down": "Swipe Down ⬇",
+}
+
+OTHER_HAND_COLOR = (140, 140, 140)  # manos que no mueven el cursor
+
+STATE_COLORS = {
+    "idle": (180, 180, 180),
+    "hovering": (0, 255, 255),
+    "clicking": (0, 255, 0),
+    "gesturing": (255, 165, 0)
+}
+
+
+@dataclass(frozen=True, slots=True)
+class HandFeatures:
+    """Immutable per-frame snapshot of one detected hand"""
+    landmarks: np.ndarray    # (21, 3) float32, pixel coordinates
+    finger_mask: int         # 5-bit mask, see THUMB..PINKY
+    palm_center: np.ndarray  # (2,) float32, middle finger MCP (x, y)
+    hand_scale: float        # wrist to middle finger MCP distance (px)
+
+    @classmethod
+    def from_landmarks(cls, landmarks):
+        """Build the snapshot from a (21, 3) float32 landmark array"""
+        return cls.batch(landmarks[None])[0]
+
+    @classmethod
+    def from_normalized(cls, landmarks, width, height):
+        """Build the snapshot from MediaPipe normalized (21, 3) landmarks"""
+        return cls.from_landmarks(landmarks * np.array((width, height, width), dtype=np.float32))
+
+    @classmethod
+    def batch(cls, hands):
+        """Snapshots for (n, 21, 3) pixel landmarks, computed for all hands at once"""
+        hands.flags.writeable = False
+        palm_center = hands[:, 9, :2]
+        hand_scale = np.linalg.norm(palm_center - hands[:, 0, :2], axis=1)
+        
+        # Thumb - Check horizontal distance from wrist
+        wrist_x = hands[:, 0, 0]
+        thumb_distance = np.abs(hands[:, 4, 0] - wrist_x)
+        thumb_base_distance = np.abs(hands[:, 2, 0] - wrist_x)
+        masks = np.where(thumb_distance > thumb_base_distance * THUMB_RATIO, THUMB, 0)
+        
+        # Other 4 fingers: tip above pip by a margin proportional to the hand
+        extended = hands[:, TIP_IDS, 1] < hands[:, PIP_IDS, 1] - FINGER_EXTEND_RATIO * hand_scale[:, None]
+        masks = masks + extended @ FINGER_BITS
+        
+        return [cls(hands[i], int(masks[i]), palm_center[i], float(hand_scale[i]))
+                for i in range(len(hands))]
+
+    @classmethod
+    def batch_normalized(cls, hand_landmarks, width, height):
+        """Snapshots for MediaPipe normalized (n, 21, 3) landmarks"""
+        return cls.batch(hand_landmarks * np.array((width, height, width), dtype=np.float32))
+
+    @property
+    def fingers(self):
+        """Finger states as a [thumb, index, middle, ring, pinky] list"""
+        return [(self.finger_mask >> i) & 1 for i in range(5)]
+
+    @property
+    def index_tip(self):
+        return self.landmarks[8, :2]
+
+
+def draw_landmarks(img, landmarks, line_color=(224, 224, 224), point_color=(0, 0, 255)):
+    """Draw the hand skeleton from a (21, 2+) pixel landmark array"""
+    points = landmarks[:, :2].astype(np.int32)
+    for a, b in HAND_CONNECTIONS:
+        cv2.line(img, tuple(points[a]), tuple(points[b]), line_color, 2)
+    for point in points:
+        cv2.circle(img, tuple(point), 2, point_color, 2)
+    return img
+
+
+def other_hands(hand_landmarks, primary, width, height):
+    """(n, 21, 2) pixel points of the normalized hand_landmarks except index primary (None: all)"""
+    if primary is not None and len(hand_landmarks):
+        hand_landmarks = np.delete(hand_landmarks, primary, axis=0)
+    return hand_landmarks[..., :2] * np.array((width, height), dtype=np.float32)
+
+
+def draw_overlay(img, features, gesture_state, gesture, show_cursor, others=()):
+    """Draw landmarks plus state/gesture info for the primary hand on img;
+    the other hands (pixel landmarks) only as a dimmed skeleton"""
+    for landmarks in others:
+        draw_landmarks(img, landmarks, OTHER_HAND_COLOR, OTHER_HAND_COLOR)
+    if features is None:
+        return img
+        
+    draw_landmarks(img, features.landmarks)
+    
+    # Display state and gesture info
+    state_color = STATE_COLORS.get(gesture_state, (255, 255, 255))
+    cv2.putText(
+        img, f'State: {gesture_state}', 
+        (10, 40), cv2.FONT_HERSHEY_SIMPLEX, 
+        0.8, state_color, 2
+    )
+    cv2.putText(
+        img, f'Gesture: {gesture}', 
+        (10, 75), cv2.FONT_HERSHEY_SIMPLEX, 
+        0.8, (0, 255, 0), 2
+    )
+    cv2.putText(
+        img, f'Fingers: {features.fingers}', 
+        (10, 110), cv2.FONT_HERSHEY_SIMPLEX, 
+        0.6, (255, 255, 0), 2
+    )
+    
+    # Draw cursor position indicator
+    if show_cursor:
+        index_tip = tuple(features.index_tip.astype(int))
+        cv2.circle(img, index_tip, 15, (0, 255, 255), 3)
+        cv2.circle(img, index_tip, 5, (0, 255, 0), -1)
+        
+    return img
+
+
+class RoiTracker:
+    """
+    Square crop around the last detected hands, resized to size x size, so
+    inference sees a fraction of the frame's pixels. Falls back to the full
+    frame when tracking is lost and every full_frame_interval frames, so new
+    hands entering elsewhere are still found.
+    """
+    def __init__(self, margin=0.3, size=256, full_frame_interval=30):
+        self.margin = margin
+        self.size = size
+        self.full_frame_interval = full_frame_interval
+        self.box = None  # (x0, y0, side, width, height): crop in pixels of a width x height frame
+        self.frames_since_full = 0
+
+    def _fits(self, img):
+        x0, y0, side, width, height = self.box
+        return img.shape[:2] == (height, width) and x0 >= 0 and y0 >= 0 and \
+            x0 + side <= width and y0 + side <= height
+
+    def crop(self, img):
+        """Return (image for inference, box or None for the full frame)."""
+        if self.box is not None and not self._fits(img):
+            self.box = None  # cambió la resolución: buscar en el frame completo
+        if self.box is None or self.frames_since_full >= self.full_frame_interval:
+            self.frames_since_full = 0
+            return img, None
+        self.frames_since_full += 1
+        x0, y0, side = self.box[:3]
+        crop = cv2.resize(img[y0:y0 + side, x0:x0 + side], (self.size, self.size),
+                          interpolation=cv2.INTER_AREA if side > self.size else cv2.INTER_LINEAR)
+        return crop, self.box
+
+    @staticmethod
+    def to_frame(hand_landmarks, box):
+        """Map crop-normalized landmarks back to normalized ones of the frame the box was cut from."""
+        x0, y0, side, width, height = box
+        scale = np.array((side / width, side / height, side / width), dtype=np.float32)
+        offset = np.array((x0 / width, y0 / height, 0.0), dtype=np.float32)
+        return hand_landmarks * scale + offset
+
+    def update(self, hand_landmarks, width, height):
+        """Center the next crop on the hands found in this frame."""
+        if not len(hand_landmarks):
+            self.box = None
+            return
+        xs = hand_landmarks[:, :, 0] * width
+        ys = hand_landmarks[:, :, 1] * height
+        x_min, x_max, y_min, y_max = xs.min(), xs.max(), ys.min(), ys.max()
+        side = int(max(x_max - x_min, y_max - y_min) * (1 + 2 * self.margin))
+        side = max(side, self.size // 2)
+        if side >= min(width, height):
+            self.box = None  # mano muy cerca: el recorte no ahorra nada
+            return
+        x0 = int(np.clip((x_min + x_max - side) / 2, 0, width - side))
+        y0 = int(np.clip((y_min + y_max - side) / 2, 0, height - side))
+        self.box = (x0, y0, side, width, height)
+
+
+
+
+class HandState:
+    """
+    Gesture state machine of one tracked hand: its own rule engine state,
+    landmark history and gesture labels, so hands in the frame never share
+    debounce counters or cooldowns.
+    """
+    def __init__(self, track_id, handedness, engine):
+        self.track_id = track_id
+        self.handedness = handedness  # "Left", "Right" or None (unknown, e.g. traces)
+        self.engine = engine
+        self.fired = None  # trigger rule fired by this frame's mask
         
         # Gesture state management
         self.gesture = ""
@@ -28,262 +248,134 @@ class HandDetector:
         self.is_hovering = False
         self.hover_stable_frames = 0
         
-        # Swipe detection
-        self.hand_positions = deque(maxlen=10)
-        self.swipe_cooldown = 0
-        self.swipe_threshold = 150  # More deliberate
-        
-        # Four fingers click detection (thumb closed, 4 fingers extended)
-        self.four_fingers_frames = 0
-        self.four_fingers_threshold = 5  # Reduced for faster response
-        self.four_fingers_cooldown = 0  # Separate cooldown for clicks
-        
-        
-        # Peace/V gesture (better for back navigation)
-        self.peace_frames = 0
-        self.peace_threshold = 10
-        self.peace_cooldown = 0
-        
-        # Pointing gesture (index finger only - alternative to hover)
-        self.pointing_frames = 0
-        
-    def find_hands(self, img, draw=True):
-        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        self.results = self.hands.process(img_rgb)
-        
-        if self.results.multi_hand_landmarks:
-            for hand_lms in self.results.multi_hand_landmarks:
-                if draw:
-                    # Draw landmarks
-                    self.mp_draw.draw_landmarks(
-                        img, hand_lms, self.mp_hands.HAND_CONNECTIONS
-                    )
-                    
-                    # Display state and gesture info
-                    state_color = {
-                        "idle": (180, 180, 180),
-                        "hovering": (0, 255, 255),
-                        "clicking": (0, 255, 0),
-                        "gesturing": (255, 165, 0)
-                    }.get(self.gesture_state, (255, 255, 255))
-                    
-                    cv2.putText(
-                        img, f'State: {self.gesture_state}', 
-                        (10, 40), cv2.FONT_HERSHEY_SIMPLEX, 
-                        0.8, state_color, 2
-                    )
-                    
-                    cv2.putText(
-                        img, f'Gesture: {self.gesture}', 
-                        (10, 75), cv2.FONT_HERSHEY_SIMPLEX, 
-                        0.8, (0, 255, 0), 2
-                    )
-                    
-                    if self.lm_list:
-                        fingers = self.fingers_up()
-                        cv2.putText(
-                            img, f'Fingers: {fingers}', 
-                            (10, 110), cv2.FONT_HERSHEY_SIMPLEX, 
-                            0.6, (255, 255, 0), 2
-                        )
-                        
-                        # Draw cursor position indicator
-                        if self.is_pointing() or self.is_hovering:
-                            index_tip = self.lm_list[8]
-                            cv2.circle(img, (index_tip[1], index_tip[2]), 15, (0, 255, 255), 3)
-                            cv2.circle(img, (index_tip[1], index_tip[2]), 5, (0, 255, 0), -1)
-        
-        # Decrease cooldowns
-        if self.swipe_cooldown > 0:
-            self.swipe_cooldown -= 1
-        if self.four_fingers_cooldown > 0:
-            self.four_fingers_cooldown -= 1
-        if self.peace_cooldown > 0:
-            self.peace_cooldown -= 1
+        # Last landmark frames of this hand, for motion gestures
+        self.history = LandmarkHistory()
+        self.features = None
+        self.palm_center = None  # last seen, to match the hand in later frames
+        self.last_seen = None
+
+    def update(self, features, timestamp):
+        """Set this frame's features (None if the hand was not seen)."""
+        self.features = features
+        if features is not None:
+            self.history.push(features.landmarks, timestamp)
+            self.palm_center = features.palm_center
+            self.last_seen = timestamp
+        else:
+            self.history.clear()  # sin mano no hay trayectoria que continuar
             
-        return img
+        # The rule engine sees each frame's mask exactly once, here, so
+        # detectors can be asked any number of times without skewing counts
+        self.fired = self.engine.update(None if features is None else features.finger_mask, timestamp)
 
-    def find_position(self, img, hand_no=0):
-        self.lm_list = []
-        if self.results.multi_hand_landmarks:
-            my_hand = self.results.multi_hand_landmarks[hand_no]
-            for id, lm in enumerate(my_hand.landmark):
-                h, w, c = img.shape
-                cx, cy = int(lm.x * w), int(lm.y * h)
-                self.lm_list.append([id, cx, cy])
-        return self.lm_list
+    def rescale(self, sx, sy):
+        """Convert the stored pixel positions after a frame size change."""
+        self.history.rescale(sx, sy)
+        if self.palm_center is not None:
+            self.palm_center = self.palm_center * np.array((sx, sy), dtype=np.float32)
 
     def fingers_up(self):
         """Detect which fingers are extended"""
-        fingers = []
-        if not self.lm_list:
+        if self.features is None:
             return []
-
-        # Thumb - Check horizontal distance from wrist
-        thumb_tip = self.lm_list[self.tip_ids[0]]
-        thumb_base = self.lm_list[2]
-        wrist = self.lm_list[0]
-        
-        thumb_distance = abs(thumb_tip[1] - wrist[1])
-        thumb_base_distance = abs(thumb_base[1] - wrist[1])
-        
-        if thumb_distance > thumb_base_distance * 1.3:
-            fingers.append(1)
-        else:
-            fingers.append(0)
-
-        # Other 4 fingers
-        for id in range(1, 5):
-            tip = self.lm_list[self.tip_ids[id]]
-            pip = self.lm_list[self.tip_ids[id] - 2]
-            
-            if tip[2] < pip[2] - 15:  # More strict
-                fingers.append(1)
-            else:
-                fingers.append(0)
-                
-        return fingers
+        return self.features.fingers
 
     def is_pointing(self):
         """Check if only index finger is extended (pointing gesture)"""
-        if not self.lm_list:
-            return False
-            
-        fingers = self.fingers_up()
-        # Index up, all others down
-        is_pointing = fingers == [0, 1, 0, 0, 0]
-        
-        if is_pointing:
-            self.pointing_frames += 1
-        else:
-            self.pointing_frames = 0
-            
-        return self.pointing_frames > 2  # Stable for 2 frames
-
+        return self.engine.is_active("pointing")
 
     def detect_peace_sign(self):
         """Detect peace/V sign (index and middle up) - Better for back navigation"""
-        if not self.lm_list or self.peace_cooldown > 0:
+        if self.fired != "back":
             return False
-
-        fingers = self.fingers_up()
-        
-        # Peace sign: only index and middle fingers up
-        is_peace = fingers == [0, 1, 1, 0, 0]
-        
-        if is_peace:
-            self.peace_frames += 1
-            
-            if self.peace_frames >= self.peace_threshold:
-                self.gesture = "Peace Sign (Back) ✌"
-                self.gesture_state = "gesturing"
-                self.peace_cooldown = 25
-                self.peace_frames = 0
-                return True
-        else:
-            self.peace_frames = 0
-            
-        return False
+        self.fired = None  # una sola vez aunque se pregunte de nuevo sin frame nuevo
+        self.gesture = "Peace Sign (Back) ✌"
+        self.gesture_state = "gesturing"
+        return True
 
     def is_fist(self):
         """Detect four fingers extended (thumb closed) gesture for clicking"""
-        if not self.lm_list or self.four_fingers_cooldown > 0:
+        if self.fired != "click":
             return False
-
-        fingers = self.fingers_up()
-        
-        # Check: thumb closed (0) and all 4 other fingers extended (1)
-        is_four_fingers = fingers == [0, 1, 1, 1, 1]
-        
-        if is_four_fingers:
-            self.four_fingers_frames += 1
-            
-            if self.four_fingers_frames >= self.four_fingers_threshold:
-                self.gesture = "Four Fingers Click! 🖐"
-                self.gesture_state = "clicking"
-                self.four_fingers_cooldown = 15  # Cooldown after click
-                self.four_fingers_frames = 0
-                return True
-        else:
-            self.four_fingers_frames = 0
-        
-        return False
+        self.fired = None
+        self.gesture = "Four Fingers Click! 🖐"
+        self.gesture_state = "clicking"
+        return True
 
     def detect_swipe(self):
         """Detect swipe gestures with improved filtering"""
-        if not self.lm_list or self.swipe_cooldown > 0:
-            self.hand_positions.clear()
+        # Only while the swipe rule's mask (open hand) is held and not cooling down
+        if not self.engine.selects("swipe") or not self.engine.ready("swipe"):
             return None
-
-        fingers = self.fingers_up()
+        rule = self.engine.rule("swipe")
         
-        # Only detect swipe with all 5 fingers extended (open hand)
-        if sum(fingers) != 5:
-            self.hand_positions.clear()
+        # Palm center movement since the open hand started, within the window
+        since = max(self.engine.held_since_time("swipe"), self.engine.now - rule.window_ms / 1000)
+        motion = self.history.motion(9, since)
+        if motion is None or motion.duration * 1000 < rule.hold_ms:
             return None
-
-        current_pos = self.lm_list[9][1]  # Palm center X
-        self.hand_positions.append(current_pos)
         
-        if len(self.hand_positions) < 8:
+        # Dominant axis; vertical swipes only if the rule allows them
+        axis = 0
+        if "y" in rule.axes and abs(motion.displacement[1]) > abs(motion.displacement[0]):
+            axis = 1
+        # Distance in hand sizes: the same swipe at any resolution or distance
+        movement = float(motion.displacement[axis]) / max(self.features.hand_scale, 1.0)
+        if abs(movement) <= rule.threshold or motion.consistency[axis] <= 0.75:
             return None
         
-        start_pos = self.hand_positions[0]
-        end_pos = self.hand_positions[-1]
-        total_movement = end_pos - start_pos
-        
-        movements = [self.hand_positions[i+1] - self.hand_positions[i] 
-                    for i in range(len(self.hand_positions)-1)]
-        
-        if total_movement > self.swipe_threshold:
-            positive_movements = sum(1 for m in movements if m > 0)
-            if positive_movements > len(movements) * 0.75:
-                self.gesture = "Swipe Right ➡"
-                self.gesture_state = "gesturing"
-                self.swipe_cooldown = 25
-                self.hand_positions.clear()
-                return "right"
-                
-        elif total_movement < -self.swipe_threshold:
-            negative_movements = sum(1 for m in movements if m < 0)
-            if negative_movements > len(movements) * 0.75:
-                self.gesture = "Swipe Left ⬅"
-                self.gesture_state = "gesturing"
-                self.swipe_cooldown = 25
-                self.hand_positions.clear()
-                return "left"
-        
-        return None
+        direction = ("right" if movement > 0 else "left") if axis == 0 else ("down" if movement > 0 else "up")
+        self.gesture = SWIPE_LABELS[direction]
+        self.gesture_state = "gesturing"
+        self.engine.fire("swipe")
+        return direction
 
     def get_hover_position(self):
         """Get current hover position using index finger tip"""
-        if not self.lm_list:
+        if self.features is None:
             self.is_hovering = False
             return None
         
-        # Only hover when pointing or when hand is relaxed (not gesturing)
-        fingers = self.fingers_up()
-        
         # Allow hover with pointing gesture or normal hand position
-        # Don't hover when making other gestures (four fingers, peace, thumb, swipe)
-        is_gesture = (
-            fingers == [0, 1, 1, 1, 1] or  # Four fingers (click)
-            fingers == [0, 1, 1, 0, 0] or  # Peace
-            sum(fingers) == 5  # Open hand (swipe)
-        )
+        # Don't hover while the mask selects another gesture (click, back, swipe)
+        rule = self.engine.classify(self.features.finger_mask)
+        is_gesture = rule is not None and rule != "pointing"
         
         if is_gesture and not self.is_pointing():
             self.is_hovering = False
             return None
         
         # Use index finger tip for precise hovering
-        index_tip = self.lm_list[8]
         self.gesture = "Hovering..."
         self.gesture_state = "hovering"
         self.is_hovering = True
         self.hover_stable_frames += 1
         
-        return index_tip[1:]  # Return x, y coordinates
+        return self.features.index_tip  # Return x, y coordinates
+
+    def detect_gestures(self, hover=True):
+        """Run every detector on the current features and return the events
+        as (kind, value) tuples: hover -> (x, y) float pixels, swipe -> direction"""
+        events = []
+        if self.features is None:
+            self.reset_state()
+            return events
+            
+        if hover:
+            hover_pos = self.get_hover_position()
+            if hover_pos is not None:
+                # Sin redondear a píxeles: a baja resolución el cursor no va a saltos
+                events.append(("hover", (float(hover_pos[0]), float(hover_pos[1]))))
+        else:
+            self.is_hovering = False
+        if self.is_fist():
+            events.append(("fist", None))
+        if self.detect_peace_sign():
+            events.append(("peace", None))
+        swipe_gesture = self.detect_swipe()
+        if swipe_gesture:
+            events.append(("swipe", swipe_gesture))
+        return events
 
     def get_state(self):
         """Get current gesture state"""
@@ -291,7 +383,356 @@ class HandDetector:
     
     def reset_state(self):
         """Reset to idle state"""
-        if not self.lm_list:
+        if self.features is None:
             self.gesture_state = "idle"
             self.gesture = ""
-            self.is_hovering = False
\ No newline at end of file
+            self.is_hovering = False
+
+
+class HandDetector:
+    # Una mano que reaparece antes de HAND_TIMEOUT conserva su estado (cooldowns)
+    HAND_TIMEOUT = 1.0  # s
+    # Distancia máxima (en tamaños de mano) para seguir a una mano visible
+    MATCH_DISTANCE = 3.0
+
+    # Modelos .task por defecto del backend "tasks" (relativos a la app)
+    TASKS_MODELS = {
+        "full": os.path.join("app", "assets", "models", "hand_landmarker.task"),
+        "lite": os.path.join("app", "assets", "models", "hand_landmarker_lite.task"),
+    }
+
+    def __init__(self, max_hands=1, detection_con=0.85, track_con=0.85, backend="solutions",
+                 roi=None, engine=None, tracker=None, model="full", model_paths=None):
+        # backend: "solutions" (mp.solutions.hands, síncrono), "tasks"
+        # (HandLandmarker en LIVE_STREAM, asíncrono) o None: solo la máquina
+        # de estados de gestos, alimentada con update_features() (replay de
+        # trazas, benchmarks) sin cv2 ni mediapipe
+        self.backend = backend
+        self.roi = roi  # optional RoiTracker
+        self.tracker = tracker  # optional app.tracking.LandmarkTracker
+        self.max_hands = max_hands
+        self.detection_con = detection_con
+        self.track_con = track_con
+        self.model_paths = {**self.TASKS_MODELS, **(model_paths or {})}
+        self.model = None
+        if backend == "solutions":
+            os.environ["MEDIAPIPE_MODEL_PATH"] = resource_path(os.path.join("mediapipe", "modules"))
+            self.mp_hands = mp.solutions.hands
+        if backend is not None:
+            self.set_model(model)
+        
+        # Reglas de gestos (máscara de dedos -> gesto): cada mano usa una copia
+        self.engine = engine or GestureEngine.default()
+        
+        # One gesture state machine per tracked hand; the primary hand (the
+        # one tracked longest) drives hover and the overlay
+        self.hand_states = {}  # track id -> HandState
+        self.primary = None
+        self.primary_index = 0  # index of the primary hand in hand_landmarks
+        self._hand_index = {}   # track id -> index in hand_landmarks (this frame)
+        self._next_track_id = 0
+        self.frame_size = None  # (width, height) the hand states' pixels refer to
+        
+        # Last inference output and the features derived from it
+        self.results = None
+        self.hand_landmarks = NO_HANDS  # (n_hands, 21, 3) float32, normalized
+        self.handedness = []            # "Left"/"Right" per hand_landmarks entry
+        self.fresh = False              # find_hands produced new landmarks
+        self.result_timestamp = None    # capture time of the frame they belong to
+        self.last_timestamp = None      # newest timestamp fed to the hand states (inferred or predicted)
+        self.inference_time = 0.0       # s spent by MediaPipe on that frame
+        
+    def set_model(self, model):
+        """
+        Load the "full" or "lite" model, replacing the current one. Raises
+        OSError if the tasks model file is missing (the current model is kept)
+        and RuntimeError/ValueError if MediaPipe cannot load it.
+        """
+        if model == self.model:
+            return
+        if self.backend == "tasks":
+            model_path = resource_path(self.model_paths[model])
+            if not os.path.exists(model_path):
+                raise FileNotFoundError(f"No se encontró el modelo {model_path}")
+        if self.model is not None:
+            self.close()
+        if self.backend == "solutions":
+            self.hands = self.mp_hands.Hands(
+                max_num_hands=self.max_hands,
+                model_complexity=0 if model == "lite" else 1,
+                min_detection_confidence=self.detection_con,
+                min_tracking_confidence=self.track_con
+            )
+        else:
+            self._create_landmarker(model_path)
+        self.model = model
+
+    def _create_landmarker(self, model_path):
+        from mediapipe.tasks.python import BaseOptions
+        from mediapipe.tasks.python import vision as mp_vision
+
+        options = mp_vision.HandLandmarkerOptions(
+            base_options=BaseOptions(model_asset_path=model_path),
+            running_mode=mp_vision.RunningMode.LIVE_STREAM,
+            num_hands=self.max_hands,
+            min_hand_detection_confidence=self.detection_con,
+            min_hand_presence_confidence=self.detection_con,
+            min_tracking_confidence=self.track_con,
+            result_callback=self._on_result,
+        )
+        self.landmarker = mp_vision.HandLandmarker.create_from_options(options)
+        self._in_flight = {}      # timestamp_ms -> (ROI box, capture timestamp, submit time), ascending
+        self._in_flight_lock = threading.Lock()
+        self._latest = None       # newest finished result, taken by find_hands
+        self._last_timestamp_ms = -1
+
+    def _on_result(self, result, image, timestamp_ms):
+        # Hilo de MediaPipe: solo convierte el resultado y lo deja para find_hands
+        with self._in_flight_lock:
+            # LIVE_STREAM descarta sin callback los frames enviados mientras
+            # está ocupado: se olvidan todos los anteriores a este resultado
+            while self._in_flight and next(iter(self._in_flight)) < timestamp_ms:
+                del self._in_flight[next(iter(self._in_flight))]
+            box, timestamp, submitted = self._in_flight.pop(timestamp_ms, (None, None, None))
+        hand_landmarks = NO_HANDS
+        if result.hand_landmarks:
+            hand_landmarks = np.array([[(lm.x, lm.y, lm.z) for lm in hand] for hand in result.hand_landmarks],
+                                      dtype=np.float32)
+        handedness = [hand[0].category_name for hand in result.handedness]
+        elapsed = time.perf_counter() - submitted if submitted is not None else 0.0
+        self._latest = (hand_landmarks, handedness, box, timestamp, elapsed)  # una asignación: atómica
+
+    def _detect_async(self, img_rgb, box, timestamp):
+        # LIVE_STREAM exige timestamps en ms estrictamente crecientes
+        timestamp_ms = max(int(timestamp * 1000), self._last_timestamp_ms + 1)
+        self._last_timestamp_ms = timestamp_ms
+        with self._in_flight_lock:
+            self._in_flight[timestamp_ms] = (box, timestamp, time.perf_counter())
+        image = mp.Image(image_format=mp.ImageFormat.SRGB, data=img_rgb)
+        self.landmarker.detect_async(image, timestamp_ms)
+
+    def find_hands(self, img, draw=True, timestamp=None):
+        """
+        Run MediaPipe inference once on the frame and keep the results.
+        With the tasks backend the frame is only queued and the newest finished
+        result (of an earlier frame) is taken instead; self.fresh is False
+        when no new result was ready, or when it is older than a frame the
+        hand states already saw (a tracker prediction). self.result_timestamp
+        is the capture time of the frame the landmarks belong to.
+        """
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        source, box = self.roi.crop(img) if self.roi else (img, None)
+        img_rgb = cv2.cvtColor(source, cv2.COLOR_BGR2RGB)
+        if self.backend == "tasks":
+            self._detect_async(img_rgb, box, timestamp)
+            result, self._latest = self._latest, None
+            if result is not None and self.last_timestamp is not None and result[3] <= self.last_timestamp:
+                result = None  # más viejo que lo ya predicho: el tiempo no puede retroceder
+            self.fresh = result is not None
+            if not self.fresh:
+                return img
+            self.hand_landmarks, self.handedness, box, self.result_timestamp, self.inference_time = result
+        else:
+            start = time.perf_counter()
+            self.results = self.hands.process(img_rgb)
+            self.inference_time = time.perf_counter() - start
+            self.hand_landmarks = self._landmarks_from_results(self.results)
+            self.handedness = self._handedness_from_results(self.results)
+            self.fresh, self.result_timestamp = True, timestamp
+        if self.roi:
+            h, w = img.shape[:2]
+            if box is not None and len(self.hand_landmarks):
+                self.hand_landmarks = RoiTracker.to_frame(self.hand_landmarks, box)
+            self.roi.update(self.hand_landmarks, w, h)
+        
+        if draw:
+            self.draw_overlay(img)
+            
+        return img
+
+    def locate(self, img, timestamp, infer=True):
+        """
+        Landmarks and features for this frame: MediaPipe inference, or while
+        the tracker is confident, its prediction. With infer=False (frame
+        skipped at reduced rate) only the prediction is tried, and otherwise
+        the hands stay as they were. Returns True if inference ran.
+        """
+        h, w = img.shape[:2]
+        if self.tracker is not None and self.tracker.confident(timestamp):
+            self.hand_landmarks = self.tracker.predict(timestamp)[None]
+            if self.roi:
+                self.roi.update(self.hand_landmarks, w, h)  # el recorte sigue a la mano predicha
+            self.find_position(img, timestamp=timestamp)
+            return False
+        if not infer:
+            return False
+        self.find_hands(img, draw=False, timestamp=timestamp)
+        if not self.fresh:
+            return False  # tasks: la inferencia de un frame anterior sigue en curso
+        timestamp = self.result_timestamp
+        self.find_position(img, timestamp=timestamp)
+        if self.tracker is not None:
+            # El tracker sigue una sola mano: con varias, se infiere siempre
+            single = self.hand_landmarks[0] if len(self.hand_landmarks) == 1 else None
+            self.tracker.update(single, timestamp, w, h)
+        return True
+
+    def close(self):
+        """Release the MediaPipe graph (and the tasks callback thread)."""
+        if self.backend == "solutions":
+            self.hands.close()
+        elif self.backend == "tasks":
+            self.landmarker.close()
+
+    @staticmethod
+    def _landmarks_from_results(results):
+        if not results.multi_hand_landmarks:
+            return NO_HANDS
+        return np.array(
+            [[(lm.x, lm.y, lm.z) for lm in hand.landmark] for hand in results.multi_hand_landmarks],
+            dtype=np.float32
+        )
+
+    @staticmethod
+    def _handedness_from_results(results):
+        if not results.multi_hand_landmarks or not getattr(results, "multi_handedness", None):
+            return []
+        return [hand.classification[0].label for hand in results.multi_handedness]
+
+    def draw_overlay(self, img):
+        """Draw the stored results on img without running inference again"""
+        h, w = img.shape[:2]
+        primary = self.primary_index if self.features is not None else None
+        return draw_overlay(img, self.features, self.gesture_state, self.gesture,
+                            self.is_pointing() or self.is_hovering,
+                            other_hands(self.hand_landmarks, primary, w, h))
+
+    def find_position(self, img, hand_no=None, timestamp=None):
+        """
+        Build the HandFeatures snapshots of every hand in this frame. Returns
+        the primary hand's features, or hand_no's if given (None without it).
+        """
+        h, w = img.shape[:2]
+        primary = self.update_hands(self.hand_landmarks, w, h, timestamp, self.handedness)
+        if hand_no is None:
+            return primary
+        state = self.state_of(hand_no)
+        return state.features if state else None
+
+    def update_features(self, landmarks, width, height, timestamp=None):
+        """
+        Set this frame's hand from normalized (21, 3) landmarks or None.
+        timestamp is the frame's capture time in seconds (default: now); all
+        gesture timing is measured on it.
+        """
+        hands = NO_HANDS if landmarks is None else landmarks[None]
+        return self.update_hands(hands, width, height, timestamp)
+
+    def update_hands(self, hand_landmarks, width, height, timestamp=None, handedness=None):
+        """
+        Set this frame's hands from normalized (n, 21, 3) landmarks, match
+        them to the tracked hands and advance every hand's state machine.
+        Returns the primary hand's features (None without hands).
+        """
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        if self.frame_size is not None and self.frame_size != (width, height):
+            # Resolución nueva (gobernador de carga): historia y centros a la escala nueva
+            sx, sy = width / self.frame_size[0], height / self.frame_size[1]
+            for state in self.hand_states.values():
+                state.rescale(sx, sy)
+        self.frame_size = (width, height)
+        self.last_timestamp = timestamp
+        features = HandFeatures.batch_normalized(hand_landmarks, width, height) if len(hand_landmarks) else []
+        handedness = handedness or [None] * len(features)
+
+        states = {}
+        self._hand_index = {}
+        candidates = dict(self.hand_states)
+        # Con una sola mano y un solo seguimiento no hay nada que desambiguar
+        gated = len(features) > 1 or len(candidates) > 1
+        for i, (hand, label) in enumerate(zip(features, handedness)):
+            state = self._match(hand, label, candidates, gated)
+            if state is None:
+                state = HandState(self._next_track_id, label, self.engine.clone())
+                self._next_track_id += 1
+            else:
+                del candidates[state.track_id]
+            state.update(hand, timestamp)
+            states[state.track_id] = state
+            self._hand_index[state.track_id] = i
+
+        # Manos no vistas: sin features este frame; se olvidan tras HAND_TIMEOUT
+        for track_id, state in candidates.items():
+            if timestamp - state.last_seen <= self.HAND_TIMEOUT:
+                state.update(None, timestamp)
+                states[track_id] = state
+        self.hand_states = dict(sorted(states.items()))
+
+        visible = [state for state in self.hand_states.values() if state.features is not None]
+        if self.primary is not None and self.primary.track_id not in self.hand_states:
+            self.primary = None  # olvidada por HAND_TIMEOUT sin pasar por un frame sin ella
+        if self.primary is None or self.primary.features is None:
+            # La mano seguida desde hace más tiempo (id más bajo), o la anterior si no hay ninguna
+            self.primary = visible[0] if visible else self.hand_states.get(
+                self.primary.track_id if self.primary else -1)
+        self.primary_index = self._hand_index.get(self.primary.track_id, 0) if self.primary else 0
+        return self.features
+
+    def _match(self, hand, label, candidates, gated=True):
+        # Mano seguida más cercana con la misma lateralidad. Las visibles en el
+        # frame anterior deben estar cerca (si gated); las perdidas hace poco no
+        best, best_distance = None, float("inf")
+        for state in candidates.values():
+            if label and state.handedness and label != state.handedness:
+                continue
+            distance = float(np.linalg.norm(state.palm_center - hand.palm_center)) / max(hand.hand_scale, 1.0)
+            if gated and state.features is not None and distance > self.MATCH_DISTANCE:
+                continue
+            if distance < best_distance:
+                best, best_distance = state, distance
+        return best
+
+    def state_of(self, hand_no):
+        """HandState of the hand at index hand_no of hand_landmarks, or None."""
+        for track_id, index in self._hand_index.items():
+            if index == hand_no:
+                return self.hand_states[track_id]
+        return None
+
+    @property
+    def features(self):
+        return self.primary.features if self.primary else None
+
+    @property
+    def gesture(self):
+        return self.primary.gesture if self.primary else ""
+
+    @property
+    def gesture_state(self):
+        return self.primary.gesture_state if self.primary else "idle"
+
+    @property
+    def is_hovering(self):
+        return self.primary.is_hovering if self.primary else False
+
+    def fingers_up(self):
+        """Detect which fingers are extended"""
+        return self.primary.fingers_up() if self.primary else []
+
+    def is_pointing(self):
+        """Check if only index finger is extended (pointing gesture)"""
+        return self.primary.is_pointing() if self.primary else False
+
+    def detect_gestures(self):
+        """Run every hand's detectors and return the events as (kind, value)
+        tuples: hover -> float pixel (x, y) of the primary hand, swipe -> direction"""
+        events = []
+        for state in self.hand_states.values():
+            events += state.detect_gestures(hover=state is self.primary)
+        return events
+
+    def get_state(self):
+        """Get current gesture state"""
+        return self.gesture_state
@@ -0,0 +1,260 @@
+import threading
+import time
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from app.capture import CameraSource
+from app.events import GestureChannel, GestureKind
+from app.governor import IdleGovernor
+from app.render import FrameBuffers, FrameRenderer
+from app.traces import TraceRecorder
+from app.vision import NO_HANDS, HandDetector, HandFeatures, other_hands
+from app.workers.inference_process import InferenceError, InferenceProcess
+
+
+class FrameSlot:
+    """
+    Single-slot mailbox between the capture thread and the inference loop.
+    The newest frame always wins: a frame that was not taken in time is dropped.
+    """
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._frame = None
+        self.dropped = 0
+
+    def put(self, frame):
+        with self._cond:
+            if self._frame is not None:
+                self.dropped += 1
+            self._frame = frame
+            self._cond.notify()
+
+    def take(self, timeout=0.1):
+        """Return the latest frame, or None if nothing arrived before timeout."""
+        with self._cond:
+            if self._frame is None:
+                self._cond.wait(timeout)
+            frame, self._frame = self._frame, None
+            return frame
+
+
+class CameraWorker(QObject):
+    """
+    Worker that owns the camera, runs hand inference and gesture logic, and
+    writes ready-to-paint frames into shared FrameBuffers for the UI.
+    Runs in a separate thread so a slow frame never blocks the GUI.
+    """
+    frame_ready = pyqtSignal()
+    error = pyqtSignal(str)
+
+    READ_FAILURES = 10        # consecutive failed reads before reporting the camera as lost
+    READ_RETRY = (0.01, 0.5)  # s between retries after a failed read: first, max (doubling)
+
+    def __init__(self, max_hands=1, detection_con=0.85, track_con=0.85,
+                 show_landmarks_only=False, source=None,
+                 inference_mode="thread", ring_slots=2, trace_path=None,
+                 governor=None, roi=None, engine=None, tracker=None, cursor_filter=None,
+                 buffers=None, backend="solutions", model="full", model_paths=None, load_governor=None,
+                 channel=None):
+        super().__init__()
+        self.detector_kwargs = {
+            "max_hands": max_hands,
+            "detection_con": detection_con,
+            "track_con": track_con,
+            "backend": backend,  # "solutions" or "tasks" (LIVE_STREAM, async)
+            "model": model,  # "full" or "lite"
+            "model_paths": model_paths,  # {"full"|"lite": .task bundle} for the tasks backend
+            "roi": roi,  # RoiTracker or None; picklable for process mode
+            "engine": engine,  # GestureEngine or None (default rules); picklable too
+            "tracker": tracker,  # LandmarkTracker or None (always infer)
+        }
+        self.buffers = buffers or FrameBuffers()
+        self.channel = channel or GestureChannel()  # gestures for the GUI thread
+        self.renderer = FrameRenderer(self.buffers, landmarks_only=show_landmarks_only)
+        self.source = source or CameraSource()  # any app.capture.FrameSource
+        self.inference_mode = inference_mode  # "thread" or "process"
+        self.ring_slots = ring_slots
+        self.recorder = TraceRecorder(trace_path) if trace_path else None
+        self.governor = governor or IdleGovernor(idle_frames=0)
+        self.load_governor = load_governor  # app.governor.LoadGovernor or None (fixed settings)
+        self.base_resolution = None
+        self.pending_resolution = None  # applied by the capture thread between reads
+        self.cursor_filter = cursor_filter  # app.filters.CursorFilter or None (raw hover)
+        self.slot = FrameSlot()
+        self._is_running = True
+
+    def run(self):
+        """
+        Captures on a helper thread and processes the latest frame in a loop
+        until stopped.
+        """
+        if not self.source.open():
+            self.error.emit("No se pudo abrir la cámara.")
+            return
+        self.base_resolution = (self.source.width, self.source.height)
+
+        if self.inference_mode == "process":
+            # MediaPipe vive en el proceso hijo; el capturador le entrega los frames
+            self.client = InferenceProcess(self.detector_kwargs, slots=self.ring_slots)
+            # plan() solo si el frame entra en el anillo: uno descartado no gasta la inferencia
+            deliver = lambda frame: self.client.submit(frame.image, frame.timestamp, lambda: self.plan(frame))
+        else:
+            # MediaPipe se crea en este hilo, que es el único que lo usa
+            try:
+                self.detector = HandDetector(**self.detector_kwargs)
+            except (OSError, RuntimeError, ValueError) as e:
+                self.source.close()
+                self.error.emit(f"No se pudo cargar el modelo de manos: {e}")
+                return
+            deliver = self.slot.put
+
+        capture_thread = threading.Thread(target=self._capture_loop, args=(deliver,), daemon=True)
+        capture_thread.start()
+        try:
+            while self._is_running:
+                if self.inference_mode == "process":
+                    result = self.client.poll()
+                    if isinstance(result, InferenceError):
+                        self.error.emit(result.message)
+                        if result.fatal:
+                            break
+                    elif result is not None:
+                        self.process_result(result)
+                else:
+                    frame = self.slot.take()
+                    if frame is not None:
+                        self.process_frame(frame)
+        finally:
+            self._is_running = False
+            capture_thread.join()
+            self.source.close()
+            if self.inference_mode == "process":
+                self.client.close()
+            else:
+                self.detector.close()
+            if self.recorder:
+                self.recorder.close()
+
+    def _capture_loop(self, deliver):
+        failures = 0
+        while self._is_running:
+            if self.pending_resolution:
+                resolution, self.pending_resolution = self.pending_resolution, None
+                self.source.set_resolution(*resolution)
+            frame = self.source.read()
+            if frame is not None:
+                failures = 0
+                deliver(frame)
+            elif self.source.exhausted:
+                break  # fin del video o de la secuencia
+            else:
+                # Cámara caída o desconectada: reintentar sin ocupar un núcleo
+                failures += 1
+                if failures == self.READ_FAILURES:
+                    self.error.emit("Se perdió la señal de la cámara.")
+                first, longest = self.READ_RETRY
+                time.sleep(min(first * 2 ** min(failures - 1, 10), longest))
+
+    def plan(self, frame):
+        """
+        What to do with a captured frame: "infer", "track" (skipped by the
+        load governor: tracker prediction or the last hands, still shown) or
+        "idle" (no hand for a while: shown without inference).
+        """
+        if self.load_governor and not self.load_governor.should_infer(frame):
+            return "idle" if self.governor.idle else "track"
+        return "infer" if self.governor.should_infer(frame) else "idle"
+
+    def process_frame(self, frame):
+        """In-thread mode: inference, gestures and rendering for one frame."""
+        img = frame.image
+        detector = self.detector
+        plan = self.plan(frame)
+        if plan != "idle":
+            # Inferencia, o predicción del tracker entre inferencias
+            if detector.locate(img, frame.timestamp, infer=plan == "infer"):
+                # Con el backend tasks los landmarks son de un frame anterior
+                landmarks_timestamp = detector.result_timestamp
+                self.governor.report(landmarks_timestamp, detector.features is not None)
+                self.report_load(landmarks_timestamp, detector.inference_time)
+                self.record(landmarks_timestamp, detector.hand_landmarks, img)
+            features = detector.features
+        else:
+            # Sin mano desde hace rato: este frame solo se muestra
+            h, w = img.shape[:2]
+            features = detector.update_features(None, w, h, frame.timestamp)
+            detector.hand_landmarks = NO_HANDS
+        events = detector.detect_gestures()
+        h, w = img.shape[:2]
+        primary = detector.primary_index if features is not None else None
+        others = other_hands(detector.hand_landmarks, primary, w, h)
+        self.publish(img, features, events, detector.gesture_state, detector.gesture,
+                     detector.is_pointing() or detector.is_hovering, frame.timestamp, others)
+
+    def process_result(self, result):
+        """Process mode: render the ring frame the child process answered for."""
+        if not result.skipped:
+            img = self.client.frame(result.slot)
+            h, w = img.shape[:2]
+            features = None
+            if len(result.hand_landmarks):
+                features = HandFeatures.from_normalized(result.hand_landmarks[result.primary], w, h)
+            if result.inferred:
+                self.governor.report(result.landmarks_timestamp, features is not None)
+                self.report_load(result.landmarks_timestamp, result.inference_time)
+                self.record(result.landmarks_timestamp, result.hand_landmarks, img)
+            others = other_hands(result.hand_landmarks, result.primary if features is not None else None, w, h)
+            self.publish(img, features, result.events,
+                         result.gesture_state, result.gesture, result.show_cursor, result.timestamp, others)
+        self.client.release(result.slot)
+
+    def report_load(self, timestamp, seconds):
+        """Feed the load governor and apply the level it switches to."""
+        if not self.load_governor:
+            return
+        level = self.load_governor.report(timestamp, seconds)
+        if level is None:
+            return
+        if self.inference_mode == "process":
+            self.client.set_model(level.model)  # un fallo llega como InferenceError
+        else:
+            try:
+                self.detector.set_model(level.model)
+            except (OSError, RuntimeError, ValueError) as e:
+                self.error.emit(f"No se pudo cambiar al modelo {level.model}: {e}")
+        width, height = self.base_resolution
+        resolution = (int(width * level.scale), int(height * level.scale))
+        if resolution != (self.source.width, self.source.height):
+            self.pending_resolution = resolution
+
+    def record(self, timestamp, hand_landmarks, img):
+        if self.recorder:
+            h, w = img.shape[:2]
+            self.recorder.append(timestamp, hand_landmarks, w, h)
+
+    def publish(self, img, features, events, gesture_state, gesture, show_cursor, timestamp, others=()):
+        h, w = img.shape[:2]
+        hovering = False
+        for kind, value in events:
+            if kind == "hover":
+                # Normalizado: el mapeo a pantalla no depende de la resolución de captura
+                x, y = value[0] / w, value[1] / h
+                if self.cursor_filter:
+                    x, y = self.cursor_filter(x, y, timestamp)
+                self.channel.hover(x, y)
+                hovering = True
+            elif kind == "fist":
+                self.channel.post(GestureKind.CLICK)
+            elif kind == "peace":
+                self.channel.post(GestureKind.BACK)
+            elif kind == "swipe":
+                self.channel.post(GestureKind.SWIPE, value)
+
+        if self.cursor_filter and not hovering:
+            self.cursor_filter.reset()  # el próximo hover empieza sin arrastrar el anterior
+        self.renderer.render(img, features, gesture_state, gesture, show_cursor, others)
+        self.frame_ready.emit()
+
+    def stop(self):
+        """Stops the capture and inference loop."""
+        self._is_running = False
@@ -0,0 +1,218 @@
+import multiprocessing
+import threading
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Este módulo no importa PyQt. Con "spawn" el hijo importa además el módulo
+# __main__ del padre (como __mp_main__): main.py importa la UI dentro de
+# main() para que el hijo solo cargue numpy, cv2 y mediapipe
+
+
+class SharedFrameRing:
+    """
+    Preallocated ring of equally-shaped uint8 frames in shared memory.
+    The parent creates and unlinks it; the child attaches to it by name.
+    """
+    def __init__(self, shape, slots, name=None):
+        self.shape = tuple(shape)
+        self.slots = slots
+        self.owner = name is None
+        if self.owner:
+            size = slots * int(np.prod(self.shape))
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            # Con "spawn" el hijo comparte el resource tracker del padre,
+            # así que el segmento se libera una sola vez con unlink()
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.frames = np.ndarray((slots, *self.shape), dtype=np.uint8, buffer=self.shm.buf)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def close(self):
+        self.frames = None  # release the buffer export before closing
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+@dataclass(frozen=True, slots=True)
+class InferenceResult:
+    """Compact per-frame answer from the child process"""
+    slot: int
+    timestamp: float
+    hand_landmarks: np.ndarray  # (n_hands, 21, 3) float32, MediaPipe normalized
+    events: list           # (kind, value) tuples from HandDetector.detect_gestures
+    gesture_state: str
+    gesture: str
+    show_cursor: bool
+    skipped: bool = False   # stale frame, dropped without inference or display
+    inferred: bool = True   # False: predicted, skipped at reduced rate or idle frame
+    primary: int = 0        # index in hand_landmarks of the hand driving hover/overlay
+    inference_time: float = 0.0  # s spent by MediaPipe (inferred frames)
+    landmarks_timestamp: float = None  # capture time of the frame hand_landmarks belong to
+
+
+@dataclass(frozen=True, slots=True)
+class InferenceError:
+    """Model load failure reported by the child process"""
+    message: str
+    fatal: bool  # the detector could not be created: no results will follow
+
+
+def _inference_main(frames_conn, results_conn, detector_kwargs):
+    """Child process entry point: run HandDetector on frames from the ring."""
+    from app.vision import NO_HANDS, HandDetector
+
+    try:
+        detector = HandDetector(**detector_kwargs)
+    except (OSError, RuntimeError, ValueError) as e:
+        results_conn.send(InferenceError(f"No se pudo cargar el modelo de manos: {e}", fatal=True))
+        while frames_conn.recv() is not None:
+            pass  # hasta que el padre cierre
+        return
+    ring = None
+    try:
+        while True:
+            msg = frames_conn.recv()
+            # Latest frame wins: answer stale frames as skipped without inference
+            stale_infer = False
+            while msg is not None and frames_conn.poll():
+                if msg[0] == "frame":
+                    results_conn.send(InferenceResult(msg[1], msg[2], None, [], "", "", False, skipped=True))
+                    stale_infer = stale_infer or msg[3] == "infer"
+                else:
+                    break
+                msg = frames_conn.recv()
+            if msg is None:
+                break
+            if stale_infer and msg[0] == "frame":
+                # La inferencia que el gobernador concedió al frame viejo pasa al nuevo
+                msg = (*msg[:3], "infer")
+
+            if msg[0] == "ring":
+                if ring:
+                    ring.close()
+                _, name, shape, slots = msg
+                ring = SharedFrameRing(shape, slots, name=name)
+                continue
+            if msg[0] == "model":
+                try:
+                    detector.set_model(msg[1])
+                except (OSError, RuntimeError, ValueError) as e:
+                    results_conn.send(InferenceError(f"No se pudo cambiar al modelo {msg[1]}: {e}", fatal=False))
+                continue
+
+            _, slot, timestamp, plan = msg
+            img = ring.frames[slot]
+            infer = False
+            if plan != "idle":
+                # Predicted frames are not inferred: no governor report, no trace
+                infer = detector.locate(img, timestamp, infer=plan == "infer")
+            else:
+                h, w = img.shape[:2]
+                detector.update_features(None, w, h, timestamp)
+                detector.hand_landmarks = NO_HANDS
+            events = detector.detect_gestures()
+            results_conn.send(InferenceResult(
+                slot, timestamp, detector.hand_landmarks, events, detector.gesture_state, detector.gesture,
+                detector.is_pointing() or detector.is_hovering,
+                inferred=infer, primary=detector.primary_index, inference_time=detector.inference_time,
+                landmarks_timestamp=detector.result_timestamp if infer else timestamp,
+            ))
+    finally:
+        detector.close()
+        if ring:
+            ring.close()
+
+
+class InferenceProcess:
+    """
+    Runs HandDetector in a child process so inference does not compete with
+    the Qt event loop and the other worker threads for the GIL.
+    submit() is called from the capture thread, poll()/release() from the
+    consumer thread.
+    """
+    def __init__(self, detector_kwargs, slots=2):
+        ctx = multiprocessing.get_context("spawn")
+        frames_recv, self.frames_conn = ctx.Pipe(duplex=False)
+        self.results_conn, results_send = ctx.Pipe(duplex=False)
+        self.process = ctx.Process(
+            target=_inference_main,
+            args=(frames_recv, results_send, detector_kwargs),
+            daemon=True,
+        )
+        self.process.start()
+        frames_recv.close()
+        results_send.close()
+
+        self.slots = slots
+        self.ring = None
+        self._free = list(range(slots))
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def submit(self, img, timestamp, plan="infer"):
+        """
+        Copy img into a free ring slot and queue it. plan is the
+        CameraWorker.plan() of the frame, or a callable returning it that is
+        called only once the frame has a slot, so a dropped frame does not
+        use up a governor decision: "track" frames are not inferred and
+        "idle" ones are only returned for display. Returns False if the
+        frame was dropped.
+        """
+        with self._lock:
+            if self.ring is None or self.ring.shape != img.shape:
+                # Cambio de resolución: esperar a que no haya frames en vuelo
+                if len(self._free) < self.slots:
+                    self.dropped += 1
+                    return False
+                if self.ring:
+                    self.ring.close()
+                self.ring = SharedFrameRing(img.shape, self.slots)
+                self.frames_conn.send(("ring", self.ring.name, self.ring.shape, self.slots))
+            if not self._free:
+                self.dropped += 1
+                return False
+            slot = self._free.pop()
+
+        np.copyto(self.ring.frames[slot], img)
+        if callable(plan):
+            plan = plan()
+        with self._lock:  # set_model() escribe en la misma tubería desde otro hilo
+            self.frames_conn.send(("frame", slot, timestamp, plan))
+        return True
+
+    def set_model(self, model):
+        """Ask the child to switch to the "full" or "lite" model."""
+        with self._lock:
+            self.frames_conn.send(("model", model))
+
+    def poll(self, timeout=0.1):
+        """Return the next InferenceResult or InferenceError, or None if none arrived in time."""
+        if not self.results_conn.poll(timeout):
+            return None
+        return self.results_conn.recv()
+
+    def frame(self, slot):
+        """Frame stored in slot; valid until release(slot)."""
+        return self.ring.frames[slot]
+
+    def release(self, slot):
+        with self._lock:
+            self._free.append(slot)
+
+    def close(self):
+        try:
+            self.frames_conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout=2)
+        if self.process.is_alive():
+            self.process.terminate()
+        if self.ring:
+            self.ring.close()
+            self.ring = None
@@ -0,0 +1 @@
+"""Herramientas de medición de rendimiento de NeuroLink (no se incluyen en el .exe)."""
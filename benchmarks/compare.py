@@ -0,0 +1,39 @@
+"""
+Compara dos resultados JSON de benchmarks.pipeline etapa por etapa.
+
+    python -m benchmarks.compare base.json nuevo.json
+"""
+import argparse
+import json
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--metric", default="p95_ms", help="mean_ms, p50_ms, p95_ms or p99_ms")
+    args = parser.parse_args()
+
+    with open(args.baseline, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.candidate, encoding="utf-8") as f:
+        cand = json.load(f)
+
+    print(f"{base['environment'].get('commit')} -> {cand['environment'].get('commit')} ({args.metric})")
+    base_runs = {(r["kind"], r["input"]): r for r in base["runs"]}
+    for run in cand["runs"]:
+        key = (run["kind"], run["input"])
+        if key not in base_runs:
+            continue
+        print(f"{run['kind']}: {run['input']}")
+        for name, stats in run["stages"].items():
+            old = base_runs[key]["stages"].get(name)
+            if not old or not old.get("count") or not stats.get("count"):
+                continue
+            before, after = old[args.metric], stats[args.metric]
+            change = (after - before) / before * 100 if before else 0.0
+            print(f"  {name:<20} {before:8.3f} -> {after:8.3f} ms  ({change:+6.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
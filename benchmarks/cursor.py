@@ -0,0 +1,113 @@
+"""
+Evalúa el filtro del cursor sobre trazas de landmarks grabadas.
+
+Para la punta del índice de cada traza compara la señal cruda, el filtro
+One Euro sin extrapolar y con la extrapolación de config.ini:
+  jitter_px  RMS de la segunda diferencia por frame (ruido de alta frecuencia)
+  lag_ms     desplazamiento temporal que mejor alinea la salida con la señal
+             cruda (positivo = va por detrás, negativo = se adelanta). Los
+             timestamps son de captura: con LeadMs bien ajustado el lag es
+             negativo y cercano a la latencia captura -> pantalla.
+  error_px   distancia media a la señal cruda con ese desplazamiento
+
+    python -m benchmarks.cursor --trace sesion.npy --config config.ini --out cursor.json
+"""
+import argparse
+import configparser
+import os
+
+import numpy as np
+
+from app.filters import CursorFilter
+from app.traces import load_trace
+from benchmarks.stats import environment, write_results
+
+INDEX_TIP = 8
+LAGS_MS = np.arange(-150, 301)
+
+
+def segments(trace):
+    """(timestamps, (n, 2) pixel index tip, frame size) for every run of frames with a hand."""
+    hands = np.asarray(trace["hands"]) > 0
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], hands.astype(np.int8), [0]))))
+    for start, stop in zip(edges[::2], edges[1::2]):
+        part = trace[start:stop]
+        size = np.asarray(part["size"][0], dtype=np.float64)
+        tips = np.asarray(part["landmarks"][:, 0, INDEX_TIP, :2], dtype=np.float64)
+        yield np.asarray(part["timestamp"], dtype=np.float64), tips * size, size
+
+
+def apply(make_filter, t, points, size):
+    if make_filter is None:
+        return points
+    cursor = make_filter()
+    normalized = points / size
+    return np.array([cursor(x, y, ts) for ts, (x, y) in zip(t, normalized)]) * size
+
+
+def evaluate(trace, make_filter):
+    jitter, lags = [], []
+    frames = 0
+    for t, points, size in segments(trace):
+        if len(t) < 5:
+            continue
+        out = apply(make_filter, t, points, size)
+        frames += len(t)
+        jitter.append(np.diff(out, n=2, axis=0))
+
+        # Error medio de la salida frente a la señal cruda retrasada lag ms
+        errors = []
+        for lag in LAGS_MS / 1000.0:
+            shifted = np.stack([np.interp(t - lag, t, points[:, i]) for i in range(2)], axis=1)
+            valid = (t - lag >= t[0]) & (t - lag <= t[-1])
+            errors.append(np.linalg.norm(out[valid] - shifted[valid], axis=1).sum() if valid.any() else np.inf)
+        lags.append(np.array(errors))
+
+    if not frames:
+        return {"frames": 0}
+    second = np.concatenate(jitter)
+    total = np.sum(lags, axis=0) / frames
+    best = int(np.argmin(total))
+    return {
+        "frames": frames,
+        "jitter_px": float(np.sqrt((np.linalg.norm(second, axis=1) ** 2).mean())),
+        "lag_ms": float(LAGS_MS[best]),
+        "error_px": float(total[best]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--trace", action="append", required=True, help="landmark trace .npy (repeatable)")
+    parser.add_argument("--config", help="config.ini con la sección [Cursor] (por defecto, valores por defecto)")
+    parser.add_argument("--out", help="write results as JSON")
+    args = parser.parse_args()
+
+    config = configparser.ConfigParser()
+    if args.config:
+        config.read(args.config)
+    configured = CursorFilter.from_config(config)
+    variants = {
+        "raw": None,
+        "one_euro": lambda: CursorFilter(configured.filter.min_cutoff, configured.filter.beta,
+                                         configured.filter.d_cutoff, lead_ms=0),
+        f"one_euro_lead_{configured.lead * 1000:.0f}ms": lambda: CursorFilter.from_config(config),
+    }
+
+    runs = []
+    for path in args.trace:
+        trace = load_trace(path)
+        results = {name: evaluate(trace, make) for name, make in variants.items()}
+        runs.append({"input": os.path.basename(path), "kind": "cursor", "variants": results})
+        print(f"cursor: {os.path.basename(path)}")
+        for name, r in results.items():
+            if r["frames"]:
+                print(f"  {name:<22} {r['frames']:6d} frames | jitter {r['jitter_px']:6.2f} px "
+                      f"| lag {r['lag_ms']:5.0f} ms | error {r['error_px']:6.2f} px")
+
+    if args.out:
+        write_results(args.out, {"environment": environment(), "runs": runs})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Mide cada etapa del pipeline de gestos sobre videos y trazas de landmarks.
+
+Videos (necesita cv2 y mediapipe): capture_decode, hands_process (incluye la
+conversión BGR->RGB), find_position, gestures y display_conversion.
+Trazas (solo numpy): find_position y gestures a partir de landmarks grabados,
+y el error de predicción del LandmarkTracker frente a los landmarks reales.
+
+    python -m benchmarks.pipeline --video sesion.mp4 --trace sesion.npy --out base.json
+    python -m benchmarks.compare base.json nuevo.json
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from app.tracking import LandmarkTracker
+from app.traces import load_trace
+from app.vision import HandDetector
+from benchmarks.stats import StageTimer, environment, print_stages, write_results
+
+
+def bench_video(path, frames=0):
+    from app.capture import VideoFileSource
+    from app.render import FrameBuffers, FrameRenderer
+
+    source = VideoFileSource(path, realtime=False, width=0, height=0)
+    if not source.open():
+        raise IOError(f"No se pudo abrir {path}")
+    detector = HandDetector()
+    renderer = FrameRenderer(FrameBuffers())
+    timer = StageTimer()
+    start = time.perf_counter()
+    try:
+        while not frames or len(timer.samples["capture_decode"]) < frames:
+            with timer.stage("capture_decode"):
+                frame = source.read()
+            if frame is None:
+                if source.exhausted:
+                    break
+                continue
+            img = frame.image
+            with timer.stage("hands_process"):
+                detector.find_hands(img, draw=False)
+            with timer.stage("find_position"):
+                features = detector.find_position(img, timestamp=frame.timestamp)
+            with timer.stage("gestures"):
+                detector.detect_gestures()
+            with timer.stage("display_conversion"):
+                renderer.render(img, features, detector.gesture_state, detector.gesture,
+                                detector.is_pointing() or detector.is_hovering)
+            timer.add("total", sum(timer.samples[name][-1] for name in
+                                   ("capture_decode", "hands_process", "find_position",
+                                    "gestures", "display_conversion")))
+    finally:
+        source.close()
+    return {"input": os.path.basename(path), "kind": "video",
+            "wall_s": time.perf_counter() - start, "stages": timer.summary()}
+
+
+def bench_trace(path, repeat=1):
+    trace = load_trace(path)
+    timer = StageTimer()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        detector = HandDetector(backend=None)
+        for record in trace:
+            width, height = record["size"]
+            with timer.stage("find_position"):
+                detector.update_hands(record["landmarks"][:record["hands"]], width, height,
+                                      float(record["timestamp"]))
+            with timer.stage("gestures"):
+                detector.detect_gestures()
+    return {"input": os.path.basename(path), "kind": "trace",
+            "wall_s": time.perf_counter() - start, "stages": timer.summary(),
+            "prediction": bench_prediction(trace)}
+
+
+def bench_prediction(trace, tracker=None):
+    """
+    Replay a trace with the tracker's skip policy: frames it is confident
+    about are predicted instead of measured, and compared to the recorded
+    landmarks. Errors are mean per-landmark distances (px and hand sizes).
+    """
+    tracker = tracker or LandmarkTracker()
+    hand_frames = 0
+    errors_px, errors_hand = [], []
+    for record in trace:
+        timestamp = float(record["timestamp"])
+        width, height = record["size"]
+        if not record["hands"]:
+            tracker.update(None, timestamp, width, height)
+            continue
+        hand_frames += 1
+        truth = record["landmarks"][0]
+        if tracker.confident(timestamp):
+            size = np.array((width, height), dtype=np.float32)
+            error = np.linalg.norm((tracker.predict(timestamp)[:, :2] - truth[:, :2]) * size, axis=1).mean()
+            errors_px.append(float(error))
+            errors_hand.append(float(error) / max(tracker.hand_scale, 1e-6))
+        else:
+            tracker.update(truth, timestamp, width, height)
+
+    def stats(values):
+        values = np.asarray(values)
+        if not len(values):
+            return {}
+        return {"mean": float(values.mean()), "p50": float(np.percentile(values, 50)),
+                "p95": float(np.percentile(values, 95)), "max": float(values.max())}
+
+    return {"hand_frames": hand_frames, "predicted": len(errors_px),
+            "predicted_fraction": len(errors_px) / hand_frames if hand_frames else 0.0,
+            "error_px": stats(errors_px), "error_hand": stats(errors_hand)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--video", action="append", default=[], help="video file (repeatable)")
+    parser.add_argument("--trace", action="append", default=[], help="landmark trace .npy (repeatable)")
+    parser.add_argument("--frames", type=int, default=0, help="limit frames per video (0 = all)")
+    parser.add_argument("--repeat", type=int, default=5, help="passes over each trace")
+    parser.add_argument("--out", help="write results as JSON")
+    args = parser.parse_args()
+    if not args.video and not args.trace:
+        parser.error("indica al menos un --video o --trace")
+
+    runs = [bench_video(path, args.frames) for path in args.video]
+    runs += [bench_trace(path, args.repeat) for path in args.trace]
+    for run in runs:
+        print_stages(f"{run['kind']}: {run['input']}", run["stages"])
+        prediction = run.get("prediction")
+        if prediction and prediction["predicted"]:
+            print(f"  {'prediction':<20} {prediction['predicted']:6d} frames "
+                  f"({prediction['predicted_fraction']:.0%} of hand frames) | "
+                  f"error mean {prediction['error_px']['mean']:.1f} px "
+                  f"p95 {prediction['error_px']['p95']:.1f} px "
+                  f"({prediction['error_hand']['p95']:.2f} hand sizes)")
+
+    if args.out:
+        write_results(args.out, {"environment": environment(), "runs": runs})
+
+
+if __name__ == "__main__":
+    main()
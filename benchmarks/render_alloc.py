@@ -0,0 +1,78 @@
+"""
+Cuenta las asignaciones de memoria por frame del camino de render.
+
+Compara el camino anterior (flip + cvtColor + QImage.copy por frame) con
+FrameRenderer sobre FrameBuffers, usando tracemalloc (numpy y cv2 reportan
+sus buffers). Sale con código 1 si el camino nuevo asigna un frame completo.
+
+    python -m benchmarks.render_alloc --frames 300
+"""
+import argparse
+import sys
+import tracemalloc
+
+import cv2
+import numpy as np
+from PyQt6.QtGui import QImage
+
+from app.render import FrameBuffers, FrameRenderer
+from app.vision import HandFeatures, draw_overlay
+from benchmarks.stats import environment, write_results
+
+
+def legacy_render(img, features, gesture_state, gesture, show_cursor):
+    display_img = draw_overlay(img, features, gesture_state, gesture, show_cursor)
+    display_img = cv2.flip(display_img, 1)
+    img_rgb = cv2.cvtColor(display_img, cv2.COLOR_BGR2RGB)
+    h, w, ch = img_rgb.shape
+    return QImage(img_rgb.data, w, h, ch * w, QImage.Format.Format_RGB888).copy()
+
+
+def sample_features(width, height):
+    rng = np.random.default_rng(0)
+    landmarks = rng.uniform(0.3, 0.7, (21, 3)).astype(np.float32)
+    return HandFeatures.from_normalized(landmarks, width, height)
+
+
+def count_allocations(render, frames, width, height):
+    """Largest number of bytes allocated during a single render call."""
+    img = np.zeros((height, width, 3), dtype=np.uint8)
+    features = sample_features(width, height)
+    render(img, features, "hovering", "Hovering...", True)  # warm-up: buffers, caches
+
+    worst = 0
+    tracemalloc.start()
+    for _ in range(frames):
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        render(img, features, "hovering", "Hovering...", True)
+        _, peak = tracemalloc.get_traced_memory()
+        worst = max(worst, peak - baseline)
+    tracemalloc.stop()
+    return {"frames": frames, "bytes_per_frame": worst, "frame_bytes": img.nbytes}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--out", help="write results as JSON")
+    args = parser.parse_args()
+
+    renderer = FrameRenderer(FrameBuffers())
+    results = {}
+    for name, render in (("legacy", legacy_render), ("buffers", renderer.render)):
+        results[name] = count_allocations(render, args.frames, args.width, args.height)
+        print(f"{name:>8}: {results[name]['bytes_per_frame']:>9} bytes allocated per frame "
+              f"({results[name]['bytes_per_frame'] / results[name]['frame_bytes']:.2f} frames)")
+
+    if args.out:
+        write_results(args.out, {"environment": environment(), "runs": results})
+    # El camino con buffers no debe asignar ni un frame por render
+    if results["buffers"]["bytes_per_frame"] >= results["buffers"]["frame_bytes"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import json
+import platform
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+import numpy as np
+
+
+def summarize(durations_s):
+    """fps and latency percentiles (ms) for a list of per-frame durations"""
+    ms = np.asarray(durations_s, dtype=np.float64) * 1000.0
+    if not len(ms):
+        return {"count": 0}
+    return {
+        "count": int(len(ms)),
+        "fps": float(1000.0 / ms.mean()) if ms.mean() > 0 else float("inf"),
+        "mean_ms": float(ms.mean()),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "max_ms": float(ms.max()),
+    }
+
+
+class StageTimer:
+    """Collects per-frame durations by stage name"""
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.samples[name].append(time.perf_counter() - start)
+
+    def add(self, name, seconds):
+        self.samples[name].append(seconds)
+
+    def summary(self):
+        return {name: summarize(values) for name, values in self.samples.items()}
+
+
+def environment():
+    """Commit and machine info so results can be compared across commits"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+    }
+
+
+def write_results(path, results):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+
+def print_stages(title, stages):
+    print(title)
+    for name, s in stages.items():
+        if s["count"]:
+            print(f"  {name:<20} {s['count']:6d} frames {s['fps']:9.1f} fps | "
+                  f"p50 {s['p50_ms']:7.3f} p95 {s['p95_ms']:7.3f} p99 {s['p99_ms']:7.3f} ms")
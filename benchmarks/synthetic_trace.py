@@ -0,0 +1,92 @@
+"""
+Genera la traza sintética de regresión de la lógica de gestos.
+
+Una mano dibujada con landmarks normalizados hace, a 30 fps: hover
+(señalando), el gesto de click, hover, el gesto de atrás, hover, un swipe a
+la derecha con la mano abierta y sale de cuadro. Es determinista: el .npy y
+el .json de eventos esperados se regeneran igual con
+
+    python -m benchmarks.synthetic_trace benchmarks/traces/gestures.npy \
+        --expected benchmarks/traces/gestures.json
+
+y se comprueban (sin cv2 ni mediapipe) con
+
+    python -m app.traces check benchmarks/traces/gestures.npy benchmarks/traces/gestures.json
+
+--expected escribe el .json con los eventos del replay actual: solo para
+actualizarlo a propósito, tras revisar que los eventos son los correctos.
+"""
+import argparse
+import json
+
+import numpy as np
+
+from app.traces import TRACE_DTYPE, discrete_events
+
+FPS = 30
+WIDTH, HEIGHT = 640, 480
+
+# (frames, máscara pulgar..meñique como bits 0..4, x inicial, x final)
+SCRIPT = [
+    (15, 0b00010, 0.5, 0.5),   # señalar: hover
+    (20, 0b11110, 0.5, 0.5),   # click
+    (15, 0b00010, 0.5, 0.5),
+    (25, 0b00110, 0.5, 0.5),   # atrás (peace)
+    (15, 0b00010, 0.5, 0.5),
+    (12, 0b11111, 0.3, 0.7),   # swipe a la derecha con la mano abierta
+    (10, 0b11111, 0.7, 0.7),
+    (20, None, 0.0, 0.0),      # sin mano
+]
+
+
+def hand(mask, x, y=0.6, scale=0.1):
+    """Normalized (21, 3) landmarks of a right hand with the fingers of mask extended."""
+    landmarks = np.zeros((21, 3), dtype=np.float32)
+    landmarks[:, 0], landmarks[:, 1] = x, y - scale  # nudillos a la altura del MCP medio
+    landmarks[0] = (x, y, 0.0)                       # muñeca
+    landmarks[9] = (x, y - scale, 0.0)               # MCP medio: tamaño de mano = scale (en y)
+    # Pulgar: extendido si la punta se aleja de la muñeca mucho más que su base
+    landmarks[2, 0] = x + 0.3 * scale
+    landmarks[4, 0] = x + (0.9 if mask & 1 else 0.3) * scale
+    for bit, tip in zip(range(1, 5), (8, 12, 16, 20)):
+        landmarks[tip - 2, 1] = y - 1.5 * scale                              # PIP
+        landmarks[tip, 1] = y - (2.5 if mask >> bit & 1 else 1.4) * scale   # punta
+    return landmarks
+
+
+def build():
+    frames = sum(count for count, *_ in SCRIPT)
+    trace = np.zeros(frames, dtype=TRACE_DTYPE)
+    i = 0
+    for count, mask, x0, x1 in SCRIPT:
+        for step in range(count):
+            record = trace[i]
+            record["timestamp"] = i / FPS
+            record["size"] = (WIDTH, HEIGHT)
+            if mask is not None:
+                record["hands"] = 1
+                record["landmarks"][0] = hand(mask, x0 + (x1 - x0) * step / max(count - 1, 1))
+            i += 1
+    return trace
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("output", help="traza .npy a escribir")
+    parser.add_argument("--expected", help="escribir también los eventos del replay actual en este .json")
+    args = parser.parse_args()
+
+    trace = build()
+    np.save(args.output, trace)
+    print(f"{len(trace)} frames guardados en {args.output}")
+    if args.expected:
+        events = discrete_events(trace)
+        with open(args.expected, "w", encoding="utf-8") as f:
+            # un evento por línea: los cambios se leen bien en un diff
+            f.write("[\n" + ",\n".join(json.dumps(event) for event in events) + "\n]\n")
+        for event in events:
+            print(event)
+
+
+if __name__ == "__main__":
+    main()
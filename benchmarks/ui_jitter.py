@@ -0,0 +1,90 @@
+"""
+Compara el jitter del hilo de UI con MediaPipe en un hilo vs. en un proceso hijo.
+
+Un QTimer de precisión corre en el hilo principal mientras CameraWorker procesa
+el video; el jitter es la desviación de cada tick respecto al intervalo pedido.
+
+    python -m benchmarks.ui_jitter --video muestra.mp4 --seconds 20 --out jitter.json
+    python -m benchmarks.ui_jitter --synthetic
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+from PyQt6.QtCore import QThread, QTimer, Qt
+from PyQt6.QtGui import QGuiApplication
+
+from app.capture import CameraSource, SyntheticSource, VideoFileSource
+from app.workers.camera_worker import CameraWorker
+from benchmarks.stats import environment, summarize, write_results
+
+
+def make_source(args):
+    if args.video:
+        return VideoFileSource(args.video, loop=True)
+    if args.synthetic:
+        return SyntheticSource()
+    return CameraSource()
+
+
+def measure(app, source, mode, seconds, tick_ms):
+    thread = QThread()
+    worker = CameraWorker(source=source, inference_mode=mode)
+    worker.moveToThread(thread)
+    thread.started.connect(worker.run)
+
+    frames = 0
+    def on_frame():
+        nonlocal frames
+        frames += 1
+    worker.frame_ready.connect(on_frame)
+
+    ticks = []
+    timer = QTimer()
+    timer.setTimerType(Qt.TimerType.PreciseTimer)
+    timer.timeout.connect(lambda: ticks.append(time.perf_counter()))
+
+    thread.start()
+    timer.start(tick_ms)
+    QTimer.singleShot(int(seconds * 1000), app.quit)
+    app.exec()
+
+    timer.stop()
+    worker.stop()
+    thread.quit()
+    thread.wait()
+
+    jitter_s = np.abs(np.diff(ticks) - tick_ms / 1000.0)
+    return {
+        "mode": mode,
+        "frames": frames,
+        "fps": frames / seconds,
+        "jitter": summarize(jitter_s),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--video", help="video file (default: camera 0)")
+    parser.add_argument("--synthetic", action="store_true", help="generated frames, no camera")
+    parser.add_argument("--seconds", type=float, default=15.0)
+    parser.add_argument("--tick-ms", type=int, default=10)
+    parser.add_argument("--modes", default="thread,process")
+    parser.add_argument("--out", help="write results as JSON")
+    args = parser.parse_args()
+
+    app = QGuiApplication(sys.argv)
+    results = [measure(app, make_source(args), mode, args.seconds, args.tick_ms)
+               for mode in args.modes.split(",")]
+
+    for r in results:
+        j = r["jitter"]
+        print(f"{r['mode']:>8}: {r['fps']:5.1f} fps | jitter p50 {j['p50_ms']:.2f} ms"
+              f" p95 {j['p95_ms']:.2f} ms p99 {j['p99_ms']:.2f} ms max {j['max_ms']:.2f} ms")
+    if args.out:
+        write_results(args.out, {"environment": environment(), "runs": results})
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,16 @@
 import sys
 import os
-from PyQt6.QtWidgets import QApplication
-from dotenv import load_dotenv
-from app.ui import MainWindow
-from app.database import create_patient_table
-from app.utils.paths import resource_path  # Importamos el solucionador
+import multiprocessing
 
 def main():
+    # Imports aquí y no arriba: con InferenceMode = process el proceso hijo
+    # ("spawn") vuelve a importar este módulo, y no debe cargar PyQt ni la UI
+    from PyQt6.QtWidgets import QApplication
+    from dotenv import load_dotenv
+    from app.ui import MainWindow
+    from app.database import create_patient_table
+    from app.utils.paths import resource_path  # Importamos el solucionador
+
     # 1. Cargar variables de entorno desde la ruta correcta (sea .exe o código)
     load_dotenv(resource_path(".env"))
 
@@ -25,4 +29,5 @@ def main():
     sys.exit(app.exec())
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # InferenceMode = process en el .exe
     main()
\ No newline at end of file